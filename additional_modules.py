@@ -1,5 +1,7 @@
 # rate_limiter.py - Rate Limiting Module
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any
 from database import Database
@@ -7,34 +9,96 @@ import config
 
 logger = logging.getLogger(__name__)
 
+# Write-behind flush thresholds
+FLUSH_INTERVAL = 30  # seconds
+FLUSH_DIRTY_LIMIT = 50  # pending users
+
 class RateLimiter:
     def __init__(self):
         self.db = Database()
-    
+        # In-memory token buckets: user_id -> counters + window starts.
+        # Common case पूरी तरह RAM से serve होता है, DB में batched flush.
+        self._buckets: Dict[int, Dict[str, Any]] = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.time()
+
     def check_rate_limit(self, user_id: int) -> bool:
         """
         User की rate limit check करता है
         Returns True if user can make request, False if rate limited
         """
         try:
-            limits = self.db.check_rate_limit(user_id)
-            
-            # Check if user exceeds limits
-            if not limits["hourly_ok"]:
-                logger.warning(f"User {user_id} exceeded hourly rate limit")
-                return False
-            
-            if not limits["daily_ok"]:
-                logger.warning(f"User {user_id} exceeded daily rate limit")
-                return False
-            
-            # Update counters
-            self.db.update_rate_limit(user_id)
+            now = time.time()
+            with self._lock:
+                bucket = self._buckets.get(user_id)
+
+                if bucket is None:
+                    # Cache miss - single atomic check+bump statement,
+                    # returned counts से bucket seed करें
+                    limits = self.db.check_and_bump_rate_limit(user_id)
+
+                    if not limits["hourly_ok"]:
+                        logger.warning(f"User {user_id} exceeded hourly rate limit")
+                        return False
+
+                    if not limits["daily_ok"]:
+                        logger.warning(f"User {user_id} exceeded daily rate limit")
+                        return False
+
+                    self._buckets[user_id] = {
+                        "hourly_count": limits["hourly_count"],
+                        "daily_count": limits["daily_count"],
+                        "hour_start": now, "day_start": now
+                    }
+                    return True
+
+                # Stale windows reset करें
+                if now - bucket["hour_start"] > 3600:
+                    bucket["hourly_count"] = 0
+                    bucket["hour_start"] = now
+                if now - bucket["day_start"] > 86400:
+                    bucket["daily_count"] = 0
+                    bucket["day_start"] = now
+
+                if bucket["hourly_count"] >= config.MAX_REQUESTS_PER_HOUR:
+                    logger.warning(f"User {user_id} exceeded hourly rate limit")
+                    return False
+
+                if bucket["daily_count"] >= config.MAX_REQUESTS_PER_DAY:
+                    logger.warning(f"User {user_id} exceeded daily rate limit")
+                    return False
+
+                bucket["hourly_count"] += 1
+                bucket["daily_count"] += 1
+                self._dirty.add(user_id)
+
+                # Batched write-behind flush
+                if (len(self._dirty) >= FLUSH_DIRTY_LIMIT
+                        or now - self._last_flush > FLUSH_INTERVAL):
+                    self._flush_locked(now)
+
             return True
-            
+
         except Exception as e:
             logger.error(f"Error checking rate limit for {user_id}: {e}")
             return True  # Allow request if error occurs
+
+    def _flush_locked(self, now: float):
+        """Dirty buckets को एक batched statement में DB flush करता है (lock held)"""
+        rows = [
+            (
+                user_id,
+                self._buckets[user_id]["hourly_count"],
+                self._buckets[user_id]["daily_count"],
+                datetime.fromtimestamp(self._buckets[user_id]["hour_start"]),
+                datetime.fromtimestamp(self._buckets[user_id]["day_start"])
+            )
+            for user_id in self._dirty
+        ]
+        self.db.flush_rate_limits(rows)
+        self._dirty.clear()
+        self._last_flush = now
     
     def get_user_limits(self, user_id: int) -> Dict[str, Any]:
         """User की current rate limit status return करता है"""
@@ -78,91 +142,166 @@ class RateLimiter:
 # categorizer.py - News Categorization Module
 import re
 import logging
+from collections import Counter
 from typing import Dict, List
 import config
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 class NewsCategori:
-    def __init__(self):
-        self.category_keywords = {
-            "🏛️ Politics": [
-                "politics", "राजनीति", "election", "चुनाव", "minister", "मंत्री", 
-                "party", "पार्टी", "government", "सरकार", "parliament", "संसद",
-                "modi", "मोदी", "congress", "कांग्रेस", "bjp", "योगी", "yogi"
-            ],
-            "💰 Business": [
-                "business", "व्यापार", "market", "बाजार", "economy", "अर्थव्यवस्था",
-                "rupee", "रुपया", "stock", "शेयर", "company", "कंपनी", "profit",
-                "money", "पैसा", "investment", "निवेश", "bank", "बैंक"
-            ],
-            "⚽ Sports": [
-                "cricket", "क्रिकेट", "football", "फुटबॉल", "sports", "खेल",
-                "match", "मैच", "player", "खिलाड़ी", "team", "टीम", "olympics",
-                "kohli", "कोहली", "dhoni", "धोनी", "fifa", "ipl"
-            ],
-            "🎬 Entertainment": [
-                "bollywood", "बॉलीवूड", "actor", "अभिनेता", "actress", "अभिनेत्री",
-                "movie", "फिल्म", "cinema", "सिनेमा", "tv", "टीवी", "celebrity",
-                "shah rukh", "शाहरुख", "salman", "सलमान", "aamir", "आमिर"
-            ],
-            "🔬 Technology": [
-                "technology", "तकनीक", "tech", "टेक", "smartphone", "स्मार्टफोन",
-                "computer", "कंप्यूटर", "internet", "इंटरनेट", "ai", "artificial",
-                "google", "गूगल", "apple", "एप्पल", "microsoft", "माइक्रोसॉफ्ट"
-            ],
-            "🌍 International": [
-                "america", "अमेरिका", "china", "चीन", "pakistan", "पाकिस्तान",
-                "russia", "रूस", "international", "अंतर्राष्ट्रीय", "world", "विश्व",
-                "ukraine", "यूक्रेन", "biden", "बाइडेन", "putin", "पुतिन"
-            ],
-            "🏥 Health": [
-                "health", "स्वास्थ्य", "hospital", "अस्पताल", "doctor", "डॉक्टर",
-                "medicine", "दवा", "covid", "कोविड", "vaccine", "वैक्सीन",
-                "disease", "बीमारी", "treatment", "इलाज", "medical", "मेडिकल"
-            ],
-            "🎓 Education": [
-                "education", "शिक्षा", "school", "स्कूल", "college", "कॉलेज",
-                "university", "विश्वविद्यालय", "student", "छात्र", "exam", "परीक्षा",
-                "neet", "नीट", "jee", "जेईई", "upsc", "यूपीएससी"
-            ],
-            "🌦️ Weather": [
-                "weather", "मौसम", "rain", "बारिश", "temperature", "तापमान",
-                "cyclone", "चक्रवात", "flood", "बाढ़", "drought", "सूखा",
-                "monsoon", "मानसून", "heat", "गर्मी", "cold", "ठंड"
-            ],
-            "🚨 Breaking": [
-                "breaking", "ब्रेकिंग", "urgent", "अर्जेंट", "alert", "अलर्ट",
-                "emergency", "आपातकाल", "accident", "दुर्घटना", "fire", "आग",
-                "crime", "अपराध", "murder", "हत्या", "robbery", "लूट"
-            ]
-        }
-    
+    # Compile-time constant - class body में रखने से dict सिर्फ import पर
+    # एक बार build होता है, हर NewsCategori() पर नहीं
+    category_keywords = {
+        "🏛️ Politics": (
+            "politics", "राजनीति", "election", "चुनाव", "minister", "मंत्री",
+            "party", "पार्टी", "government", "सरकार", "parliament", "संसद",
+            "modi", "मोदी", "congress", "कांग्रेस", "bjp", "योगी", "yogi"
+        ),
+        "💰 Business": (
+            "business", "व्यापार", "market", "बाजार", "economy", "अर्थव्यवस्था",
+            "rupee", "रुपया", "stock", "शेयर", "company", "कंपनी", "profit",
+            "money", "पैसा", "investment", "निवेश", "bank", "बैंक"
+        ),
+        "⚽ Sports": (
+            "cricket", "क्रिकेट", "football", "फुटबॉल", "sports", "खेल",
+            "match", "मैच", "player", "खिलाड़ी", "team", "टीम", "olympics",
+            "kohli", "कोहली", "dhoni", "धोनी", "fifa", "ipl"
+        ),
+        "🎬 Entertainment": (
+            "bollywood", "बॉलीवूड", "actor", "अभिनेता", "actress", "अभिनेत्री",
+            "movie", "फिल्म", "cinema", "सिनेमा", "tv", "टीवी", "celebrity",
+            "shah rukh", "शाहरुख", "salman", "सलमान", "aamir", "आमिर"
+        ),
+        "🔬 Technology": (
+            "technology", "तकनीक", "tech", "टेक", "smartphone", "स्मार्टफोन",
+            "computer", "कंप्यूटर", "internet", "इंटरनेट", "ai", "artificial",
+            "google", "गूगल", "apple", "एप्पल", "microsoft", "माइक्रोसॉफ्ट"
+        ),
+        "🌍 International": (
+            "america", "अमेरिका", "china", "चीन", "pakistan", "पाकिस्तान",
+            "russia", "रूस", "international", "अंतर्राष्ट्रीय", "world", "विश्व",
+            "ukraine", "यूक्रेन", "biden", "बाइडेन", "putin", "पुतिन"
+        ),
+        "🏥 Health": (
+            "health", "स्वास्थ्य", "hospital", "अस्पताल", "doctor", "डॉक्टर",
+            "medicine", "दवा", "covid", "कोविड", "vaccine", "वैक्सीन",
+            "disease", "बीमारी", "treatment", "इलाज", "medical", "मेडिकल"
+        ),
+        "🎓 Education": (
+            "education", "शिक्षा", "school", "स्कूल", "college", "कॉलेज",
+            "university", "विश्वविद्यालय", "student", "छात्र", "exam", "परीक्षा",
+            "neet", "नीट", "jee", "जेईई", "upsc", "यूपीएससी"
+        ),
+        "🌦️ Weather": (
+            "weather", "मौसम", "rain", "बारिश", "temperature", "तापमान",
+            "cyclone", "चक्रवात", "flood", "बाढ़", "drought", "सूखा",
+            "monsoon", "मानसून", "heat", "गर्मी", "cold", "ठंड"
+        ),
+        "🚨 Breaking": (
+            "breaking", "ब्रेकिंग", "urgent", "अर्जेंट", "alert", "अलर्ट",
+            "emergency", "आपातकाल", "accident", "दुर्घटना", "fire", "आग",
+            "crime", "अपराध", "murder", "हत्या", "robbery", "लूट"
+        )
+    }
+
+    # Keyword → category का reverse map (दोनों matchers के लिए common)
+    _keyword_to_category = {
+        keyword.lower(): category
+        for category, keywords in category_keywords.items()
+        for keyword in keywords
+    }
+
+    # सभी keywords को एक Aho-Corasick automaton में precompile करें
+    # ताकि detect_category में text पर single pass ही लगे - class level
+    # पर, इसलिए instantiation essentially free है
+    if ahocorasick:
+        ac = ahocorasick.Automaton()
+        for _keyword, _category in _keyword_to_category.items():
+            ac.add_word(_keyword, (_category, _keyword))
+        ac.make_automaton()
+        _pattern = None
+        del _keyword, _category
+    else:
+        # pyahocorasick ना मिले तो compiled regex alternation fallback -
+        # फिर भी C-level single pass ही होता है। लंबे keywords को पहले
+        # रखें ताकि छोटे keywords उन्हें mask ना करें।
+        ac = None
+        _pattern = re.compile(
+            "|".join(
+                sorted(map(re.escape, _keyword_to_category),
+                       key=len, reverse=True)
+            ),
+            re.IGNORECASE
+        )
+
+    def _best_category(self, news_lower: str):
+        """Lowercased text पर single scan से best category (या None) देता है"""
+        category_scores = Counter()
+        if self.ac:
+            for _, (category, _) in self.ac.iter(news_lower):
+                category_scores[category] += 1
+        else:
+            for hit in self._pattern.findall(news_lower):
+                category_scores[self._keyword_to_category[hit]] += 1
+
+        if category_scores:
+            return category_scores.most_common(1)[0][0]
+        return None
+
     def detect_category(self, news_text: str) -> str:
         """News text का category detect करता है"""
         try:
-            news_lower = news_text.lower()
-            category_scores = {}
-            
-            for category, keywords in self.category_keywords.items():
-                score = 0
-                for keyword in keywords:
-                    if keyword.lower() in news_lower:
-                        score += 1
-                category_scores[category] = score
-            
-            # Highest score वाला category return करें
-            if category_scores and max(category_scores.values()) > 0:
-                best_category = max(category_scores, key=category_scores.get)
+            best_category = self._best_category(news_text.lower())
+
+            if best_category:
                 logger.info(f"Detected category: {best_category}")
                 return best_category
-            
+
             # Default category
             return "🔔 General"
-            
+
         except Exception as e:
             logger.error(f"Error detecting category: {e}")
             return "🔔 General"
+
+    def recategorize_all_entries(self) -> int:
+        """पूरी news_entries table को bulk re-categorize करता है
+
+        Per-row detect_category + UPDATE की जगह सारी rows एक बार पढ़कर
+        precompiled matcher से scan करता है और results एक ही batched
+        executemany + commit में वापस लिखता है।
+        """
+        try:
+            from database import Database
+            db = Database()
+
+            with db._get_connection() as conn:
+                rows = conn.execute('''
+                    SELECT id, original_news FROM news_entries
+                ''').fetchall()
+
+                updates = [
+                    (self._best_category(row['original_news'].lower()) or "🔔 General",
+                     row['id'])
+                    for row in rows
+                ]
+
+                conn.executemany('''
+                    UPDATE news_entries SET category = ? WHERE id = ?
+                ''', updates)
+                conn.commit()
+
+            logger.info(f"Re-categorized {len(updates)} news entries")
+            return len(updates)
+
+        except Exception as e:
+            logger.error(f"Error re-categorizing news entries: {e}")
+            return 0
     
     def get_category_stats(self) -> Dict[str, int]:
         """सभी categories की statistics return करता है"""
@@ -186,7 +325,10 @@ class NewsCategori:
             return {}
 
 # analytics.py - Analytics Module
+import atexit
 import logging
+import queue
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from database import Database
@@ -194,22 +336,66 @@ import config
 
 logger = logging.getLogger(__name__)
 
+# Batched analytics writer settings
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_INTERVAL = 0.5  # seconds
+
 class Analytics:
     def __init__(self):
         self.db = Database()
-    
+        # Per-call INSERT+commit की जगह actions queue में जाते हैं और
+        # background thread उन्हें batches में single commit से लिखता है
+        self._log_queue = queue.Queue()
+        self._drain_thread = threading.Thread(target=self._drain_loop, daemon=True)
+        self._drain_thread.start()
+        atexit.register(self._flush_pending)
+
     def log_user_action(self, user_id: int, action_type: str, action_data: str = None):
         """User action को log करता है"""
+        try:
+            self._log_queue.put_nowait((user_id, action_type, action_data, datetime.now()))
+        except Exception as e:
+            logger.error(f"Error logging user action: {e}")
+
+    def _drain_loop(self):
+        """Background writer - queued actions को batches में DB में लिखता है"""
+        while True:
+            try:
+                batch = [self._log_queue.get(timeout=LOG_FLUSH_INTERVAL)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[tuple]):
+        """Action batch को एक ही transaction में insert करता है"""
         try:
             with self.db._get_connection() as conn:
-                conn.execute('''
-                    INSERT INTO analytics (user_id, action_type, action_data)
-                    VALUES (?, ?, ?)
-                ''', (user_id, action_type, action_data))
+                conn.executemany('''
+                    INSERT INTO analytics (user_id, action_type, action_data, timestamp)
+                    VALUES (?, ?, ?, ?)
+                ''', batch)
                 conn.commit()
-                
+
         except Exception as e:
-            logger.error(f"Error logging user action: {e}")
+            logger.error(f"Error writing analytics batch: {e}")
+
+    def _flush_pending(self):
+        """Shutdown पर बची हुई queued entries flush करता है"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
     
     def log_news_processed(self, user_id: int, original_length: int, enhanced_length: int):
         """News processing को log करता है"""
@@ -224,27 +410,34 @@ class Analytics:
     def get_daily_analytics(self, date: str = None) -> Dict[str, Any]:
         """Daily analytics return करता है"""
         if not date:
-            date = datetime.now().strftime('%Y-%m-%d')
+            # isoformat() strftime के format-string parsing से सस्ता है
+            date = datetime.now().date().isoformat()
         
         try:
+            # DATE(timestamp) = ? index use नहीं कर सकता - raw timestamp
+            # range bind करें ताकि ix_analytics_ts पर range scan हो
+            day_start = f"{date} 00:00:00"
+            day_end = (datetime.strptime(date, '%Y-%m-%d')
+                       + timedelta(days=1)).strftime('%Y-%m-%d 00:00:00')
+
             with self.db._get_connection() as conn:
                 # User actions
                 actions = conn.execute('''
                     SELECT action_type, COUNT(*) as count
                     FROM analytics
-                    WHERE DATE(timestamp) = ?
+                    WHERE timestamp >= ? AND timestamp < ?
                     GROUP BY action_type
-                ''', (date,)).fetchall()
-                
+                ''', (day_start, day_end)).fetchall()
+
                 # Top users
                 top_users = conn.execute('''
                     SELECT user_id, COUNT(*) as actions
                     FROM analytics
-                    WHERE DATE(timestamp) = ?
+                    WHERE timestamp >= ? AND timestamp < ?
                     GROUP BY user_id
                     ORDER BY actions DESC
                     LIMIT 5
-                ''', (date,)).fetchall()
+                ''', (day_start, day_end)).fetchall()
                 
                 return {
                     "date": date,
@@ -262,20 +455,30 @@ class Analytics:
         start_date = end_date - timedelta(days=7)
         
         try:
-            daily_stats = []
-            for i in range(7):
-                date = (start_date + timedelta(days=i)).strftime('%Y-%m-%d')
-                stats = self.db.get_daily_stats(date)
-                daily_stats.append(stats)
-            
-            # Weekly totals
-            total_users = sum(day['active_users'] for day in daily_stats)
-            total_news = sum(day['total_news'] for day in daily_stats)
-            total_posts = sum(day['total_posts'] for day in daily_stats)
+            # 7 अलग queries की जगह पूरी range एक ही बार fetch करें
+            # (date arithmetic + isoformat - हर iteration पर strftime नहीं)
+            start_day = start_date.date()
+            dates = [(start_day + timedelta(days=i)).isoformat() for i in range(7)]
+            stats_by_date = self.db.get_range_stats(dates[0], dates[-1])
+
+            daily_stats = [
+                stats_by_date.get(date, {
+                    "date": date, "active_users": 0, "total_news": 0,
+                    "avg_improvement": 0, "total_posts": 0
+                })
+                for date in dates
+            ]
+
+            # Weekly totals - तीन अलग passes की जगह एक fused loop
+            total_users = total_news = total_posts = 0
+            for day in daily_stats:
+                total_users += day['active_users']
+                total_news += day['total_news']
+                total_posts += day['total_posts']
             
             return {
-                "week_start": start_date.strftime('%Y-%m-%d'),
-                "week_end": end_date.strftime('%Y-%m-%d'),
+                "week_start": start_day.isoformat(),
+                "week_end": end_date.date().isoformat(),
                 "daily_stats": daily_stats,
                 "totals": {
                     "active_users": total_users,
@@ -1,24 +1,26 @@
 # admin_commands.py - Admin Commands Module
 import logging
+import os
+import time
 from typing import Dict, Any, List
+import config
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from auth_manager import AuthManager
+from channel_manager import ChannelManager
 from database import Database
 from analytics import Analytics
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
-class AdminCommands:
-    def __init__(self):
-        self.auth_manager = AuthManager()
-        self.db = Database()
-        self.analytics = Analytics()
-    
-    async def show_admin_panel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Admin panel display करता है"""
-        admin_text = """
+# ChannelManager bot session बनाता है - हर callback पर नया instance
+# बनाने की जगह module-level singleton reuse करें
+_channel_manager = ChannelManager()
+
+# Static panel texts और markups immutable हैं - हर click पर दोबारा
+# allocate करने की जगह import पर एक बार build करें
+_ADMIN_PANEL_TEXT = """
 🔐 **Admin Panel**
 
 👨‍💼 **User Management:**
@@ -46,34 +48,157 @@ class AdminCommands:
 
 Choose an option:
 """
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("👥 Users", callback_data="admin_users"),
-                InlineKeyboardButton("📊 Stats", callback_data="admin_stats")
-            ],
-            [
-                InlineKeyboardButton("⚙️ Settings", callback_data="admin_settings"),
-                InlineKeyboardButton("📝 Logs", callback_data="admin_logs")
-            ],
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh"),
-                InlineKeyboardButton("❌ Close", callback_data="admin_close")
-            ]
-        ]
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
+
+_ADMIN_PANEL_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("👥 Users", callback_data="admin_users"),
+        InlineKeyboardButton("📊 Stats", callback_data="admin_stats")
+    ],
+    [
+        InlineKeyboardButton("⚙️ Settings", callback_data="admin_settings"),
+        InlineKeyboardButton("📝 Logs", callback_data="admin_logs")
+    ],
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh"),
+        InlineKeyboardButton("❌ Close", callback_data="admin_close")
+    ]
+])
+
+_USER_MGMT_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("✅ Authorize Users", callback_data="show_pending"),
+        InlineKeyboardButton("👥 View All Users", callback_data="show_all_users")
+    ],
+    [
+        InlineKeyboardButton("🚫 Banned Users", callback_data="show_banned"),
+        InlineKeyboardButton("📊 User Stats", callback_data="user_stats")
+    ],
+    [InlineKeyboardButton("🔙 Back", callback_data="admin_back")]
+])
+
+_ADMIN_STATS_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📈 Daily Report", callback_data="daily_report"),
+        InlineKeyboardButton("📊 Weekly Stats", callback_data="weekly_stats")
+    ],
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="admin_stats"),
+        InlineKeyboardButton("🔙 Back", callback_data="admin_back")
+    ]
+])
+
+# Partially-dynamic stats view का template भी import पर ही तैयार रहता है -
+# per-callback सिर्फ format_map होता है
+_ADMIN_STATS_TEMPLATE = """
+📊 **Bot Statistics**
+
+**Today ({date}):**
+👥 Active Users: {active_users}
+📰 News Processed: {total_news}
+📈 Avg Improvement: {avg_improvement} chars
+📤 Posts: {total_posts}
+
+**Yesterday:**
+👥 Users: {y_active_users}
+📰 News: {y_total_news}
+
+**Channel Stats:**
+📺 Channel: {channel_title}
+👥 Members: {member_count}
+📝 Total Posts: {channel_total_posts}
+
+**Top Users Today:**
+"""
+
+_ADMIN_SETTINGS_TEXT = """
+⚙️ **Bot Settings**
+
+**Current Configuration:**
+🤖 AI Model: GPT-3.5 Turbo
+⏱️ Rate Limit: 10/hour, 50/day
+📝 Min News Length: 50 chars
+📝 Max News Length: 2000 chars
+🔄 Auto Backup: Enabled
+📊 Analytics: Enabled
+
+**Channel Settings:**
+📺 Channel: @yourchannel
+🔗 Auto Post: Enabled
+⏰ Post Times: 9:00, 14:00, 20:00
+
+**Actions Available:**
+"""
+
+_ADMIN_SETTINGS_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔄 Update Limits", callback_data="update_limits"),
+        InlineKeyboardButton("📺 Channel Config", callback_data="channel_config")
+    ],
+    [
+        InlineKeyboardButton("💾 Backup Now", callback_data="backup_now"),
+        InlineKeyboardButton("🧹 Cleanup Data", callback_data="cleanup_data")
+    ],
+    [
+        InlineKeyboardButton("🔧 AI Settings", callback_data="ai_settings"),
+        InlineKeyboardButton("🔙 Back", callback_data="admin_back")
+    ]
+])
+
+_ADMIN_LOGS_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="admin_logs"),
+        InlineKeyboardButton("📊 Error Logs", callback_data="error_logs")
+    ],
+    [InlineKeyboardButton("🔙 Back", callback_data="admin_back")]
+])
+
+# System health snapshot का TTL cache - bursty admin refreshes पर हर बार
+# /proc parsing और stat calls ना हों
+_SYSTEM_SNAPSHOT_TTL = 5  # seconds
+_system_snapshot: Dict[str, Any] = None
+_system_snapshot_time = 0.0
+
+def _get_system_snapshot() -> Dict[str, Any]:
+    """System metrics का cached snapshot return करता है"""
+    global _system_snapshot, _system_snapshot_time
+
+    now = time.time()
+    if _system_snapshot is None or now - _system_snapshot_time > _SYSTEM_SNAPSHOT_TTL:
+        import psutil
+
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+
+        _system_snapshot = {
+            "cpu_percent": psutil.cpu_percent(),
+            "memory_percent": memory.percent,
+            "memory_free_gb": memory.available // (1024**3),
+            "disk_percent": disk.percent,
+            "disk_free_gb": disk.free // (1024**3),
+            "db_size_mb": os.path.getsize(config.DATABASE_NAME) / (1024 * 1024)
+        }
+        _system_snapshot_time = now
+
+    return _system_snapshot
+
+class AdminCommands:
+    def __init__(self):
+        self.auth_manager = AuthManager()
+        self.db = Database()
+        self.analytics = Analytics()
+    
+    async def show_admin_panel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Admin panel display करता है"""
         if update.callback_query:
             await update.callback_query.edit_message_text(
-                admin_text, 
-                reply_markup=reply_markup,
+                _ADMIN_PANEL_TEXT,
+                reply_markup=_ADMIN_PANEL_MARKUP,
                 parse_mode='Markdown'
             )
         else:
             await update.message.reply_text(
-                admin_text, 
-                reply_markup=reply_markup,
+                _ADMIN_PANEL_TEXT,
+                reply_markup=_ADMIN_PANEL_MARKUP,
                 parse_mode='Markdown'
             )
     
@@ -102,36 +227,25 @@ Choose an option:
         pending_users = self.auth_manager.get_pending_users()
         authorized_users = self.auth_manager.get_authorized_users()
         
-        text = f"""
+        parts = [f"""
 👥 **User Management**
 
 📋 **Pending Users:** {len(pending_users)}
 ✅ **Authorized Users:** {len(authorized_users)}
 
 **Recent Pending Users:**
-"""
-        
+"""]
+
         for user in pending_users[:5]:
             username = user['username'] or "No username"
             join_date = user['join_date'][:10] if user['join_date'] else "Unknown"
-            text += f"• {username} (ID: {user['user_id']}) - {join_date}\n"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("✅ Authorize Users", callback_data="show_pending"),
-                InlineKeyboardButton("👥 View All Users", callback_data="show_all_users")
-            ],
-            [
-                InlineKeyboardButton("🚫 Banned Users", callback_data="show_banned"),
-                InlineKeyboardButton("📊 User Stats", callback_data="user_stats")
-            ],
-            [InlineKeyboardButton("🔙 Back", callback_data="admin_back")]
-        ]
+            parts.append(f"• {username} (ID: {user['user_id']}) - {join_date}\n")
+
+        text = "".join(parts)
         
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await update.callback_query.edit_message_text(
-            text, 
-            reply_markup=reply_markup,
+            text,
+            reply_markup=_USER_MGMT_MARKUP,
             parse_mode='Markdown'
         )
     
@@ -143,94 +257,35 @@ Choose an option:
         )
         
         # Channel stats
-        from channel_manager import ChannelManager
-        channel_manager = ChannelManager()
-        channel_stats = await channel_manager.get_channel_stats()
-        
-        text = f"""
-📊 **Bot Statistics**
-
-**Today ({today_stats['date']}):**
-👥 Active Users: {today_stats['active_users']}
-📰 News Processed: {today_stats['total_news']}
-📈 Avg Improvement: {today_stats['avg_improvement']} chars
-📤 Posts: {today_stats['total_posts']}
-
-**Yesterday:**
-👥 Users: {yesterday_stats['active_users']}
-📰 News: {yesterday_stats['total_news']}
-
-**Channel Stats:**
-📺 Channel: {channel_stats.get('channel_title', 'N/A')}
-👥 Members: {channel_stats.get('member_count', 'N/A')}
-📝 Total Posts: {channel_stats.get('total_posts', 'N/A')}
+        channel_stats = await _channel_manager.get_channel_stats()
+        
+        parts = [_ADMIN_STATS_TEMPLATE.format_map({
+            **today_stats,
+            "y_active_users": yesterday_stats['active_users'],
+            "y_total_news": yesterday_stats['total_news'],
+            "channel_title": channel_stats.get('channel_title', 'N/A'),
+            "member_count": channel_stats.get('member_count', 'N/A'),
+            "channel_total_posts": channel_stats.get('total_posts', 'N/A')
+        })]
 
-**Top Users Today:**
-"""
-        
         top_users = self.db.get_top_users(5)
-        for i, user in enumerate(top_users, 1):
-            username = user['username'] or f"User {user['user_id']}"
-            text += f"{i}. {username} - {user['total_requests']} requests\n"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📈 Daily Report", callback_data="daily_report"),
-                InlineKeyboardButton("📊 Weekly Stats", callback_data="weekly_stats")
-            ],
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data="admin_stats"),
-                InlineKeyboardButton("🔙 Back", callback_data="admin_back")
-            ]
-        ]
+        for i, (user_id, username, total_requests, _news_count) in enumerate(top_users, 1):
+            username = username or f"User {user_id}"
+            parts.append(f"{i}. {username} - {total_requests} requests\n")
+
+        text = "".join(parts)
         
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await update.callback_query.edit_message_text(
-            text, 
-            reply_markup=reply_markup,
+            text,
+            reply_markup=_ADMIN_STATS_MARKUP,
             parse_mode='Markdown'
         )
     
     async def show_admin_settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Admin settings panel दिखाता है"""
-        text = """
-⚙️ **Bot Settings**
-
-**Current Configuration:**
-🤖 AI Model: GPT-3.5 Turbo
-⏱️ Rate Limit: 10/hour, 50/day
-📝 Min News Length: 50 chars
-📝 Max News Length: 2000 chars
-🔄 Auto Backup: Enabled
-📊 Analytics: Enabled
-
-**Channel Settings:**
-📺 Channel: @yourchannel
-🔗 Auto Post: Enabled
-⏰ Post Times: 9:00, 14:00, 20:00
-
-**Actions Available:**
-"""
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🔄 Update Limits", callback_data="update_limits"),
-                InlineKeyboardButton("📺 Channel Config", callback_data="channel_config")
-            ],
-            [
-                InlineKeyboardButton("💾 Backup Now", callback_data="backup_now"),
-                InlineKeyboardButton("🧹 Cleanup Data", callback_data="cleanup_data")
-            ],
-            [
-                InlineKeyboardButton("🔧 AI Settings", callback_data="ai_settings"),
-                InlineKeyboardButton("🔙 Back", callback_data="admin_back")
-            ]
-        ]
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await update.callback_query.edit_message_text(
-            text, 
-            reply_markup=reply_markup,
+            _ADMIN_SETTINGS_TEXT,
+            reply_markup=_ADMIN_SETTINGS_MARKUP,
             parse_mode='Markdown'
         )
     
@@ -238,31 +293,26 @@ Choose an option:
         """Admin logs दिखाता है"""
         logs = self.auth_manager.get_admin_logs(10)
         
-        text = "📝 **Recent Admin Logs:**\n\n"
-        
+        parts = ["📝 **Recent Admin Logs:**\n\n"]
+
         for log in logs:
             admin_name = log['admin_username'] or f"Admin {log['admin_id']}"
             target_name = log['target_username'] or f"User {log['target_user_id']}"
             timestamp = log['timestamp'][:16] if log['timestamp'] else "Unknown"
-            
-            text += f"⏰ {timestamp}\n"
-            text += f"👨‍💼 {admin_name}\n"
-            text += f"🎯 Action: {log['action']}\n"
-            text += f"👤 Target: {target_name}\n"
-            text += f"📝 Details: {log['details']}\n\n"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data="admin_logs"),
-                InlineKeyboardButton("📊 Error Logs", callback_data="error_logs")
-            ],
-            [InlineKeyboardButton("🔙 Back", callback_data="admin_back")]
-        ]
+
+            parts.append(
+                f"⏰ {timestamp}\n"
+                f"👨‍💼 {admin_name}\n"
+                f"🎯 Action: {log['action']}\n"
+                f"👤 Target: {target_name}\n"
+                f"📝 Details: {log['details']}\n\n"
+            )
+
+        text = "".join(parts)
         
-        reply_markup = InlineKeyboardMarkup(keyboard)
         await update.callback_query.edit_message_text(
-            text, 
-            reply_markup=reply_markup,
+            text,
+            reply_markup=_ADMIN_LOGS_MARKUP,
             parse_mode='Markdown'
         )
     
@@ -302,10 +352,8 @@ Choose an option:
             return
         
         message = " ".join(context.args)
-        
-        from channel_manager import ChannelManager
-        channel_manager = ChannelManager()
-        result = await channel_manager.broadcast_to_subscribers(message)
+
+        result = await _channel_manager.broadcast_to_subscribers(message)
         
         response = f"""
 📢 **Broadcast Results:**
@@ -381,36 +429,27 @@ Choose an option:
         """System health check करता है"""
         if not self.auth_manager.is_admin(update.effective_user.id):
             return
-        
-        import psutil
-        import os
-        
-        # System metrics
-        cpu_percent = psutil.cpu_percent()
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        # Database size
-        db_size = os.path.getsize(config.DATABASE_NAME) / (1024 * 1024)  # MB
-        
+
+        snapshot = _get_system_snapshot()
+
         text = f"""
 🏥 **System Health Check**
 
 🖥️ **System Resources:**
-• CPU Usage: {cpu_percent}%
-• Memory: {memory.percent}% ({memory.available // (1024**3)} GB free)
-• Disk: {disk.percent}% ({disk.free // (1024**3)} GB free)
+• CPU Usage: {snapshot['cpu_percent']}%
+• Memory: {snapshot['memory_percent']}% ({snapshot['memory_free_gb']} GB free)
+• Disk: {snapshot['disk_percent']}% ({snapshot['disk_free_gb']} GB free)
 
 💾 **Database:**
-• Size: {db_size:.2f} MB
-• Status: {"✅ Healthy" if db_size < 100 else "⚠️ Large"}
+• Size: {snapshot['db_size_mb']:.2f} MB
+• Status: {"✅ Healthy" if snapshot['db_size_mb'] < 100 else "⚠️ Large"}
 
 🤖 **Bot Status:**
 • Active: ✅
 • Uptime: {self._get_uptime()}
 • Errors: {self._get_error_count()}
 """
-        
+
         await update.message.reply_text(text, parse_mode='Markdown')
     
     def _get_uptime(self) -> str:
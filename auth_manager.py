@@ -1,38 +1,116 @@
 # auth_manager.py - User Authentication Module
 import logging
-from typing import List, Dict, Any
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Any, Tuple
 from database import Database
 import config
 
 logger = logging.getLogger(__name__)
 
+# Hot-path SQL को module-level constants रखें ताकि sqlite3 का statement
+# cache इन्हें same string से reliably match कर सके (re-parse bypass)
+_SQL_USER_ROW = "SELECT is_authorized, is_active FROM users WHERE user_id = ?"
+
+_SQL_ADMIN_LOGS = '''
+    SELECT al.id, al.admin_id, al.action, al.target_user_id,
+           al.details, al.timestamp,
+           u.username as admin_username,
+           tu.username as target_username
+    FROM admin_logs al
+    LEFT JOIN users u ON al.admin_id = u.user_id
+    LEFT JOIN users tu ON al.target_user_id = tu.user_id
+    ORDER BY al.timestamp DESC
+    LIMIT ?
+'''
+
+# सभी AuthManager instances यही shared frozenset use करते हैं
+_ADMIN_IDS = config.ADMIN_USER_IDS_SET
+
+def _rows_to_dicts(rows) -> List[Dict[str, Any]]:
+    """sqlite3.Row list को dicts में materialize करता है
+
+    Column names एक ही बार पढ़कर zip से build करना per-row dict(row)
+    conversion से सस्ता है - बड़े admin log dumps में फर्क दिखता है।
+    """
+    if not rows:
+        return []
+    keys = rows[0].keys()
+    return [dict(zip(keys, row)) for row in rows]
+
 class AuthManager:
     def __init__(self):
         self.db = Database()
-        self.admin_ids = set(config.ADMIN_USER_IDS)
-    
+        # is_authorized/get_user_permissions/check_user_exists सब एक ही
+        # users row पर आधारित हैं - row को छोटे TTL के साथ cache करें
+        # ताकि हर message पर SQLite hit ना हो
+        self._user_cache: Dict[int, Tuple[float, Any]] = {}
+        self._user_cache_ttl = 30  # seconds
+        # admin_logs append-only है - last seen MAX(id) के साथ result cache
+        # रखें, नई rows आने पर ही JOIN+ORDER+LIMIT दोबारा चले
+        self._logs_cache: Dict[int, Tuple[Any, List[Dict[str, Any]]]] = {}
+        # Single-flight: एक ही user के concurrent cache misses में सिर्फ
+        # पहला caller DB query करता है, बाकी उसी result का wait करते हैं
+        self._user_inflight: Dict[int, threading.Event] = {}
+
+    def _load_user_row(self, user_id: int):
+        """User का (is_authorized, is_active) tuple लाता है, TTL cache के साथ
+
+        Returns None अगर user database में exist नहीं करता।
+        """
+        now = time.monotonic()
+        cached = self._user_cache.get(user_id)
+        if cached and now - cached[0] < self._user_cache_ttl:
+            return cached[1]
+
+        # कोई और thread इसी user को पहले से load कर रहा है तो उसका
+        # result wait करें - thundering herd में N queries की जगह 1
+        evt = self._user_inflight.get(user_id)
+        if evt:
+            evt.wait()
+            cached = self._user_cache.get(user_id)
+            if cached:
+                return cached[1]
+            # Loader fail हुआ - fall through, खुद query करें
+
+        evt = threading.Event()
+        self._user_inflight[user_id] = evt
+        try:
+            with self.db._get_connection() as conn:
+                user = conn.execute(_SQL_USER_ROW, (user_id,)).fetchone()
+
+            row = (bool(user['is_authorized']), bool(user['is_active'])) if user else None
+
+            # Cache bounded रखें
+            if len(self._user_cache) > 4096:
+                self._user_cache.clear()
+            self._user_cache[user_id] = (now, row)
+
+            return row
+        finally:
+            self._user_inflight.pop(user_id, None)
+            evt.set()
+
     def is_authorized(self, user_id: int) -> bool:
         """Check करता है कि user authorized है या नहीं"""
         try:
             # Admin हमेशा authorized होते हैं
-            if user_id in self.admin_ids:
+            if user_id in _ADMIN_IDS:
                 return True
-            
-            # Database से check करें
-            with self.db._get_connection() as conn:
-                user = conn.execute('''
-                    SELECT is_authorized FROM users WHERE user_id = ?
-                ''', (user_id,)).fetchone()
-                
-                return user and user['is_authorized']
-                
-        except Exception as e:
+
+            row = self._load_user_row(user_id)
+            return bool(row and row[0])
+
+        # Hot path पर narrow catch - DB errors के अलावा bugs swallow ना हों
+        except sqlite3.Error as e:
             logger.error(f"Error checking authorization for {user_id}: {e}")
             return False
     
-    def is_admin(self, user_id: int) -> bool:
+    @staticmethod
+    def is_admin(user_id: int) -> bool:
         """Check करता है कि user admin है या नहीं"""
-        return user_id in self.admin_ids
+        return user_id in _ADMIN_IDS
     
     def authorize_user(self, user_id: int, admin_id: int) -> bool:
         """User को authorize करता है"""
@@ -54,7 +132,8 @@ class AuthManager:
                 ''', (admin_id, user_id))
                 
                 conn.commit()
-                
+
+            self._user_cache.pop(user_id, None)
             logger.info(f"User {user_id} authorized by admin {admin_id}")
             return True
             
@@ -81,7 +160,8 @@ class AuthManager:
                 ''', (admin_id, user_id))
                 
                 conn.commit()
-                
+
+            self._user_cache.pop(user_id, None)
             logger.info(f"Authorization revoked for user {user_id} by admin {admin_id}")
             return True
             
@@ -96,12 +176,12 @@ class AuthManager:
                 users = conn.execute('''
                     SELECT user_id, username, first_name, join_date, 
                            last_activity, total_requests
-                    FROM users 
-                    WHERE is_authorized = TRUE
+                    FROM users
+                    WHERE is_authorized = 1
                     ORDER BY last_activity DESC
                 ''').fetchall()
                 
-                return [dict(user) for user in users]
+                return _rows_to_dicts(users)
                 
         except Exception as e:
             logger.error(f"Error getting authorized users: {e}")
@@ -113,17 +193,49 @@ class AuthManager:
             with self.db._get_connection() as conn:
                 users = conn.execute('''
                     SELECT user_id, username, first_name, join_date
-                    FROM users 
-                    WHERE is_authorized = FALSE AND is_active = TRUE
+                    FROM users
+                    WHERE is_authorized = 0 AND is_active = 1
                     ORDER BY join_date DESC
                 ''').fetchall()
                 
-                return [dict(user) for user in users]
+                return _rows_to_dicts(users)
                 
         except Exception as e:
             logger.error(f"Error getting pending users: {e}")
             return []
-    
+
+    def iter_authorized_users(self):
+        """Authorized users को row-by-row stream करता है
+
+        get_authorized_users का lazy version - iterate-only callers
+        (broadcast जैसे) के लिए पूरी list का 2x allocation बचाता है।
+        """
+        conn = self.db._get_connection()
+        cursor = conn.execute('''
+            SELECT user_id, username, first_name, join_date,
+                   last_activity, total_requests
+            FROM users
+            WHERE is_authorized = 1
+            ORDER BY last_activity DESC
+        ''')
+        cursor.arraysize = 128
+        for row in cursor:
+            yield dict(row)
+
+    def iter_pending_users(self):
+        """Pending users को row-by-row stream करता है"""
+        conn = self.db._get_connection()
+        cursor = conn.execute('''
+            SELECT user_id, username, first_name, join_date
+            FROM users
+            WHERE is_authorized = 0 AND is_active = 1
+            ORDER BY join_date DESC
+        ''')
+        cursor.arraysize = 128
+        for row in cursor:
+            yield dict(row)
+
+
     def ban_user(self, user_id: int, admin_id: int, reason: str = "") -> bool:
         """User को ban करता है"""
         try:
@@ -143,7 +255,8 @@ class AuthManager:
                 ''', (admin_id, user_id, f"User banned. Reason: {reason}"))
                 
                 conn.commit()
-                
+
+            self._user_cache.pop(user_id, None)
             logger.info(f"User {user_id} banned by admin {admin_id}. Reason: {reason}")
             return True
             
@@ -170,7 +283,8 @@ class AuthManager:
                 ''', (admin_id, user_id))
                 
                 conn.commit()
-                
+
+            self._user_cache.pop(user_id, None)
             logger.info(f"User {user_id} unbanned by admin {admin_id}")
             return True
             
@@ -181,28 +295,25 @@ class AuthManager:
     def get_user_permissions(self, user_id: int) -> Dict[str, bool]:
         """User की permissions return करता है"""
         try:
-            with self.db._get_connection() as conn:
-                user = conn.execute('''
-                    SELECT is_authorized, is_active FROM users WHERE user_id = ?
-                ''', (user_id,)).fetchone()
-                
-                if not user:
-                    return {
-                        "is_authorized": False,
-                        "is_admin": False,
-                        "is_active": False,
-                        "can_post": False
-                    }
-                
-                is_admin = self.is_admin(user_id)
-                
+            row = self._load_user_row(user_id)
+
+            if not row:
                 return {
-                    "is_authorized": user['is_authorized'],
-                    "is_admin": is_admin,
-                    "is_active": user['is_active'],
-                    "can_post": user['is_authorized'] and user['is_active']
+                    "is_authorized": False,
+                    "is_admin": False,
+                    "is_active": False,
+                    "can_post": False
                 }
-                
+
+            is_authorized, is_active = row
+
+            return {
+                "is_authorized": is_authorized,
+                "is_admin": self.is_admin(user_id),
+                "is_active": is_active,
+                "can_post": is_authorized and is_active
+            }
+
         except Exception as e:
             logger.error(f"Error getting permissions for {user_id}: {e}")
             return {"is_authorized": False, "is_admin": False, "is_active": False, "can_post": False}
@@ -211,18 +322,19 @@ class AuthManager:
         """Admin logs return करता है"""
         try:
             with self.db._get_connection() as conn:
-                logs = conn.execute('''
-                    SELECT al.*, u.username as admin_username, 
-                           tu.username as target_username
-                    FROM admin_logs al
-                    LEFT JOIN users u ON al.admin_id = u.user_id
-                    LEFT JOIN users tu ON al.target_user_id = tu.user_id
-                    ORDER BY al.timestamp DESC
-                    LIMIT ?
-                ''', (limit,)).fetchall()
-                
-                return [dict(log) for log in logs]
-                
+                # MAX(id) probe primary key पर O(1) है - unchanged होने पर
+                # cached result reuse करें
+                cur_max = conn.execute("SELECT MAX(id) FROM admin_logs").fetchone()[0]
+                cached = self._logs_cache.get(limit)
+                if cached and cached[0] == cur_max:
+                    return cached[1]
+
+                logs = conn.execute(_SQL_ADMIN_LOGS, (limit,)).fetchall()
+                result = _rows_to_dicts(logs)
+                self._logs_cache[limit] = (cur_max, result)
+                return result
+
+
         except Exception as e:
             logger.error(f"Error getting admin logs: {e}")
             return []
@@ -230,14 +342,9 @@ class AuthManager:
     def check_user_exists(self, user_id: int) -> bool:
         """Check करता है कि user database में exist करता है"""
         try:
-            with self.db._get_connection() as conn:
-                user = conn.execute('''
-                    SELECT user_id FROM users WHERE user_id = ?
-                ''', (user_id,)).fetchone()
-                
-                return user is not None
-                
-        except Exception as e:
+            return self._load_user_row(user_id) is not None
+
+        except sqlite3.Error as e:
             logger.error(f"Error checking user existence {user_id}: {e}")
             return False
     
@@ -247,21 +354,63 @@ class AuthManager:
         logger.info(f"Auto authorization {'enabled' if enabled else 'disabled'}")
     
     def bulk_authorize_users(self, user_ids: List[int], admin_id: int) -> Dict[str, Any]:
-        """Multiple users को एक साथ authorize करता है"""
-        success_count = 0
-        failed_count = 0
-        failed_users = []
-        
-        for user_id in user_ids:
-            if self.authorize_user(user_id, admin_id):
-                success_count += 1
-            else:
-                failed_count += 1
-                failed_users.append(user_id)
-        
-        return {
-            "success_count": success_count,
-            "failed_count": failed_count,
-            "failed_users": failed_users,
-            "total_processed": len(user_ids)
-        }
\ No newline at end of file
+        """Multiple users को एक ही transaction में authorize करता है
+
+        Per-user authorize_user calls M transactions और M fsyncs करते थे;
+        अब दोनों statements executemany से चलते हैं और commit एक बार होता है।
+        """
+        if not user_ids or not self.is_admin(admin_id):
+            if not self.is_admin(admin_id):
+                logger.warning(f"Non-admin {admin_id} tried bulk authorization")
+            return {
+                "success_count": 0,
+                "failed_count": len(user_ids),
+                "failed_users": list(user_ids),
+                "total_processed": len(user_ids)
+            }
+
+        try:
+            placeholders = ",".join("?" * len(user_ids))
+            with self.db._get_connection() as conn:
+                # सिर्फ existing users ही authorize हो सकते हैं
+                existing = {
+                    row['user_id'] for row in conn.execute(
+                        f"SELECT user_id FROM users WHERE user_id IN ({placeholders})",
+                        user_ids
+                    )
+                }
+                to_authorize = [uid for uid in user_ids if uid in existing]
+
+                conn.executemany('''
+                    UPDATE users SET is_authorized = TRUE
+                    WHERE user_id = ?
+                ''', [(uid,) for uid in to_authorize])
+
+                conn.executemany('''
+                    INSERT INTO admin_logs (admin_id, action, target_user_id, details)
+                    VALUES (?, 'authorize_user', ?, 'User authorized')
+                ''', [(admin_id, uid) for uid in to_authorize])
+
+                conn.commit()
+
+            for uid in to_authorize:
+                self._user_cache.pop(uid, None)
+
+            failed_users = [uid for uid in user_ids if uid not in existing]
+            logger.info(f"Bulk authorized {len(to_authorize)} users by admin {admin_id}")
+
+            return {
+                "success_count": len(to_authorize),
+                "failed_count": len(failed_users),
+                "failed_users": failed_users,
+                "total_processed": len(user_ids)
+            }
+
+        except Exception as e:
+            logger.error(f"Error bulk authorizing users: {e}")
+            return {
+                "success_count": 0,
+                "failed_count": len(user_ids),
+                "failed_users": list(user_ids),
+                "total_processed": len(user_ids)
+            }
\ No newline at end of file
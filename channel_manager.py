@@ -1,18 +1,59 @@
 # channel_manager.py - Channel Management Module
 import logging
+import re
+import time
+import weakref
 from typing import Optional, Dict, Any
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.error import TelegramError, RetryAfter
+from telegram.request import HTTPXRequest
 import config
 from database import Database
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Bot एक persistent HTTPX pool रखता है - हर ChannelManager के लिए नया
+# बनाने की जगह same-loop users एक instance share करते हैं। HTTP/2 से
+# concurrent sends एक ही TLS session पर multiplex होते हैं (broadcast
+# fanout के लिए)। httpx की pooled connections उस loop से bound होती हैं
+# जिसने उन्हें बनाया - main application loop और scheduler का private
+# loop एक pool share नहीं कर सकते, इसलिए Bot per-loop cache होता है
+_bots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def _get_bot() -> Bot:
+    """Current running loop का shared Bot instance return करता है"""
+    loop = asyncio.get_running_loop()
+    bot = _bots.get(loop)
+    if bot is None:
+        bot = Bot(
+            token=config.TELEGRAM_BOT_TOKEN,
+            request=HTTPXRequest(
+                http_version="2",
+                connection_pool_size=64,
+                pool_timeout=30
+            )
+        )
+        _bots[loop] = bot
+    return bot
+
+# Channel title/member count धीरे बदलते हैं - TTL cache
+_CHAT_META_TTL = 60  # seconds
+_chat_meta: Dict[str, Any] = None
+_chat_meta_time = 0.0
+
+# Whitespace-only check बिना strip() allocation के
+_NON_WS_RE = re.compile(r'\S')
+
 class ChannelManager:
     def __init__(self):
-        self.bot = Bot(token=config.TELEGRAM_BOT_TOKEN)
         self.db = Database()
+
+    @property
+    def bot(self) -> Bot:
+        # Coroutine के अंदर ही access होता है - जिस loop पर चल रहे हैं
+        # उसी का pool मिलता है
+        return _get_bot()
         
     async def post_to_channel(self, content: str, parse_mode: str = 'Markdown') -> Dict[str, Any]:
         """
@@ -48,7 +89,7 @@ class ChannelManager:
             return {
                 "success": True,
                 "message_id": message.message_id,
-                "post_url": f"https://t.me/{config.CHANNEL_ID.replace('@', '')}/{message.message_id}",
+                "post_url": config.CHANNEL_URL_PREFIX + str(message.message_id),
                 "post_time": message.date
             }
             
@@ -72,11 +113,12 @@ class ChannelManager:
         Scheduled post के लिए content save करता है
         """
         try:
+            # created_at SQLite के DEFAULT CURRENT_TIMESTAMP से भरता है -
+            # Python-side datetime allocation और clock mismatch दोनों गए
             schedule_data = {
                 "content": content,
                 "scheduled_time": scheduled_time,
-                "status": "pending",
-                "created_at": datetime.now()
+                "status": "pending"
             }
             
             schedule_id = self.db.save_scheduled_post(schedule_data)
@@ -141,21 +183,36 @@ class ChannelManager:
         Channel की statistics return करता है
         """
         try:
-            chat = await self.bot.get_chat(config.CHANNEL_ID)
-            
+            meta = await self._get_chat_meta()
+
             stats = {
-                "channel_title": chat.title,
-                "member_count": await self.bot.get_chat_member_count(config.CHANNEL_ID),
+                "channel_title": meta["channel_title"],
+                "member_count": meta["member_count"],
                 "total_posts": self.db.get_total_posts_count(),
                 "posts_today": self.db.get_posts_count_today(),
                 "last_post_time": self.db.get_last_post_time()
             }
-            
+
             return stats
-            
+
         except Exception as e:
             logger.error(f"Error getting channel stats: {e}")
             return {"error": str(e)}
+
+    async def _get_chat_meta(self) -> Dict[str, Any]:
+        """Chat title/member count का TTL-cached snapshot return करता है"""
+        global _chat_meta, _chat_meta_time
+
+        now = time.time()
+        if _chat_meta is None or now - _chat_meta_time > _CHAT_META_TTL:
+            chat = await self.bot.get_chat(config.CHANNEL_ID)
+            _chat_meta = {
+                "channel_title": chat.title,
+                "member_count": await self.bot.get_chat_member_count(config.CHANNEL_ID)
+            }
+            _chat_meta_time = now
+
+        return _chat_meta
     
     async def pin_message(self, message_id: int) -> bool:
         """
@@ -205,11 +262,20 @@ class ChannelManager:
         """
         Post content को validate करता है
         """
-        if not content or not content.strip():
+        if not content:
             return False
-        if len(content) > 4096:  # Telegram message limit
+
+        # Telegram की 4096 limit UTF-16 code units में है - emoji जैसे
+        # non-BMP characters दो units गिनते हैं। Python-level len() से
+        # quick accept/reject, boundary cases पर ही encode करें।
+        n = len(content)
+        if n > 4096:
+            return False
+        if n > 2048 and len(content.encode('utf-16-le')) > 4096 * 2:
             return False
-        return True
+
+        # strip() की string allocation के बिना whitespace-only reject
+        return _NON_WS_RE.search(content) is not None
     
     async def send_media_post(self, content: str, media_url: str, media_type: str = "photo") -> Dict[str, Any]:
         """
@@ -248,26 +314,49 @@ class ChannelManager:
         """
         Subscribers को direct message भेजता है
         """
-        subscribers = self.db.get_active_subscribers()
-        success_count = 0
-        failed_count = 0
-        
-        for subscriber_id in subscribers:
-            try:
-                await self.bot.send_message(
-                    chat_id=subscriber_id,
-                    text=content,
-                    parse_mode='Markdown'
-                )
-                success_count += 1
-                await asyncio.sleep(0.5)  # Rate limiting
-                
-            except Exception as e:
-                logger.error(f"Failed to send to {subscriber_id}: {e}")
-                failed_count += 1
-        
+        # Serial send + sleep की जगह bounded concurrency - Telegram bot
+        # limit ~30 msg/s है इसलिए 20 parallel sends safe हैं
+        semaphore = asyncio.Semaphore(20)
+
+        async def _send_one(subscriber_id: int) -> bool:
+            async with semaphore:
+                try:
+                    await self.bot.send_message(
+                        chat_id=subscriber_id,
+                        text=content,
+                        parse_mode='Markdown'
+                    )
+                    return True
+
+                except RetryAfter as e:
+                    # Telegram का flood control - बताए गए interval के बाद
+                    # एक retry, फिर हार मान लो
+                    await asyncio.sleep(e.retry_after)
+                    try:
+                        await self.bot.send_message(
+                            chat_id=subscriber_id,
+                            text=content,
+                            parse_mode='Markdown'
+                        )
+                        return True
+                    except Exception as retry_error:
+                        logger.error(f"Retry failed for {subscriber_id}: {retry_error}")
+                        return False
+
+                except Exception as e:
+                    logger.error(f"Failed to send to {subscriber_id}: {e}")
+                    return False
+
+        # Cached array('q') से fanout - gather वैसे भी सारी coroutines
+        # upfront materialize करता है, streaming से कुछ नहीं बचता, और
+        # 60s TTL cache back-to-back broadcasts पर SQLite query बचाता है
+        results = await asyncio.gather(
+            *(_send_one(sub) for sub in self.db.get_active_subscribers())
+        )
+        success_count = sum(results)
+
         return {
             "total_sent": success_count,
-            "failed": failed_count,
-            "total_subscribers": len(subscribers)
+            "failed": len(results) - success_count,
+            "total_subscribers": len(results)
         }
\ No newline at end of file
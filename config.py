@@ -1,24 +1,34 @@
 # config.py - Configuration File
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# .env file को process में सिर्फ एक बार parse करें - बाकी re-imports/
+# subprocess spawns पर disk read skip हो जाता है
+if not os.environ.get("_ENV_LOADED"):
+    load_dotenv()
+    os.environ["_ENV_LOADED"] = "1"
 
 # Telegram Bot Settings
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "YOUR_BOT_TOKEN_HERE")
 CHANNEL_ID = os.getenv("CHANNEL_ID", "@yourchannelusername")
 CHANNEL_LINK = os.getenv("CHANNEL_LINK", "https://t.me/yourchannelusername")
+# Post URL बनाने के लिए precomputed pieces (per-post str.replace ना हो)
+CHANNEL_NAME = CHANNEL_ID.lstrip('@')
+CHANNEL_URL_PREFIX = f"https://t.me/{CHANNEL_NAME}/"
 
 # AI API Settings
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "YOUR_OPENAI_API_KEY")
 AI_MODEL = "gpt-3.5-turbo"  # या "gpt-4" if you have access
+MAX_CONCURRENT_AI = 5  # Bulk enhancement में simultaneous API calls की limit
 
 # Admin Settings
 ADMIN_USER_IDS = [
     123456789,  # Your telegram user ID
     987654321,  # Another admin ID
 ]
+# Hot-path membership checks के लिए frozen set version
+ADMIN_USER_IDS_SET = frozenset(ADMIN_USER_IDS)
 
 # Database Settings
 DATABASE_NAME = "news_bot.db"
@@ -53,6 +63,14 @@ Requirements:
 Enhanced News:
 """
 
+# Template को placeholder पर import के समय एक बार split करें - हर AI call
+# पर str.format parser चलाने की जगह सीधा concatenation हो
+_AI_PROMPT_PREFIX, _AI_PROMPT_SUFFIX = AI_PROMPT_TEMPLATE.split("{original_news}", 1)
+
+def build_ai_prompt(original_news: str) -> str:
+    """Precompiled prefix/suffix से AI prompt build करता है"""
+    return _AI_PROMPT_PREFIX + original_news + _AI_PROMPT_SUFFIX
+
 # Scheduler Settings
 AUTO_POST_TIMES = ["09:00", "14:00", "20:00"]  # Daily auto post times
 TIMEZONE = "Asia/Kolkata"
@@ -82,7 +100,9 @@ ENABLE_ANALYTICS = True
 ENABLE_MULTI_LANGUAGE = False
 
 # News Categories
-NEWS_CATEGORIES = {
+# MappingProxyType से ये dicts read-only views बनते हैं - accidental
+# mutation रुकता है और shared access पर defensive copies की जरूरत नहीं
+NEWS_CATEGORIES = MappingProxyType({
     "🏛️": "Politics",
     "💰": "Business", 
     "⚽": "Sports",
@@ -93,10 +113,10 @@ NEWS_CATEGORIES = {
     "🎓": "Education",
     "🌦️": "Weather",
     "🚨": "Breaking"
-}
+})
 
 # Response Messages
-MESSAGES = {
+MESSAGES = MappingProxyType({
     "unauthorized": "❌ आप इस bot को use करने के लिए authorized नहीं हैं। Admin से contact करें।",
     "processing": "🔄 आपकी news को AI से enhance कर रहा हूं... कृपया wait करें।",
     "success": "✅ News successfully processed और channel में post हो गई!",
@@ -104,7 +124,7 @@ MESSAGES = {
     "rate_limit": "⏰ आपने rate limit exceed कर दिया है। कुछ देर बाद try करें।",
     "too_short": f"📝 News कम से कम {MIN_NEWS_LENGTH} characters की होनी चाहिए।",
     "too_long": f"📝 News {MAX_NEWS_LENGTH} characters से ज्यादा नहीं होनी चाहिए।"
-}
+})
 
 # Webhook Settings (if using webhook instead of polling)
 WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")
@@ -1,6 +1,11 @@
 # database.py - Database Management Module
 import sqlite3
+import atexit
 import logging
+import queue
+import time
+from array import array
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import config
@@ -8,18 +13,58 @@ import threading
 
 logger = logging.getLogger(__name__)
 
+# Background writer एक pass में इतने queued writes तक batch करता है
+WRITE_BATCH_SIZE = 128
+
 class Database:
     def __init__(self):
         self.db_name = config.DATABASE_NAME
         self.lock = threading.Lock()
+        self._tls = threading.local()
         self._create_tables()
-    
+
     def _get_connection(self):
-        """Database connection बनाता है"""
-        conn = sqlite3.connect(self.db_name)
-        conn.row_factory = sqlite3.Row
+        """Per-thread persistent database connection return करता है
+
+        हर call पर नया connection खोलने की जगह thread-local connection
+        reuse होता है - schema parsing और page cache warmup एक ही बार।
+        `with` block transaction scope की तरह पहले जैसा ही काम करता है।
+        """
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            # बड़ा statement cache - hot path के repeated SQL re-parse ना हों
+            conn = sqlite3.connect(self.db_name, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-20000")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+            # INSERT OR REPLACE का implicit DELETE भी triggers fire करे -
+            # वरना stats_cache count re-adds पर inflate हो जाता है
+            conn.execute("PRAGMA recursive_triggers=ON")
+            self._tls.conn = conn
         return conn
-    
+
+    @contextmanager
+    def _tx(self):
+        """Write methods के लिए explicit single transaction
+
+        BEGIN IMMEDIATE से write lock तुरंत मिल जाता है (बीच में lock
+        upgrade deadlock नहीं) और method के सारे statements एक ही commit
+        यानी एक ही fsync में जाते हैं। Error पर rollback।
+        """
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
     def _create_tables(self):
         """सभी required tables बनाता है"""
         with self._get_connection() as conn:
@@ -117,49 +162,252 @@ class Database:
                 )
             ''')
             
+            # बीते दिनों के daily aggregates का materialized rollup -
+            # हर stats call पर news_entries re-aggregate ना हो
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS daily_rollup (
+                    date TEXT PRIMARY KEY,
+                    active_users INTEGER,
+                    total_news INTEGER,
+                    avg_improvement REAL,
+                    total_posts INTEGER
+                )
+            ''')
+
+            # AI-enhanced news का persistent cache - same text दोबारा आने
+            # पर OpenAI call skip होती है
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ai_cache (
+                    hash BLOB PRIMARY KEY,
+                    category TEXT,
+                    enhanced TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Denormalized user count - हर stats call पर COUNT(*) scan की
+            # जगह triggers से incrementally maintained single row
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS stats_cache (
+                    id INTEGER PRIMARY KEY CHECK(id = 1),
+                    total_users INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            conn.execute('''
+                INSERT OR IGNORE INTO stats_cache (id, total_users)
+                VALUES (1, (SELECT COUNT(*) FROM users))
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS users_count_ins
+                AFTER INSERT ON users BEGIN
+                    UPDATE stats_cache SET total_users = total_users + 1 WHERE id = 1;
+                END
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS users_count_del
+                AFTER DELETE ON users BEGIN
+                    UPDATE stats_cache SET total_users = total_users - 1 WHERE id = 1;
+                END
+            ''')
+
+            # Hot lookup columns के indexes - table बढ़ने पर full scan
+            # की जगह B-tree probe
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_news_user
+                ON news_entries(user_id)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_news_created
+                ON news_entries(created_at)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_users_requests
+                ON users(total_requests DESC)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_posts_time
+                ON channel_posts(post_time)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_ratelimits_day_reset
+                ON rate_limits(last_day_reset)
+            ''')
+            # Scheduler का due-posts scan - pending rows पर partial index,
+            # ORDER BY scheduled_time भी index order से free मिलता है
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_posts_pending
+                ON scheduled_posts(scheduled_time)
+                WHERE status = 'pending'
+            ''')
+
+            # Analytics queries के लिए indexes - DATE() full scan की जगह
+            # timestamp range से B-tree probe हो सके
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS ix_analytics_ts
+                ON analytics(timestamp)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS ix_analytics_user_ts
+                ON analytics(user_id, timestamp)
+            ''')
+
+            # admin_logs joins दोनों बार users से username उठाते हैं -
+            # covering index से row fetch की जरूरत नहीं पड़ती
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_users_id_username
+                ON users(user_id, username)
+            ''')
+
+            # Admin dashboard की user lists के लिए partial indexes -
+            # full table scan + sort की जगह index-order scan
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_users_authz_activity
+                ON users(last_activity DESC)
+                WHERE is_authorized = 1
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_users_pending_join
+                ON users(join_date DESC)
+                WHERE is_authorized = 0 AND is_active = 1
+            ''')
+
             conn.commit()
             logger.info("Database tables created successfully")
     
+    def _ensure_writer(self):
+        """Background writer thread को lazily start करता है
+
+        Event loop वाले callers के fire-and-forget writes इस thread में
+        drain होते हैं - handler कभी fsync पर नहीं रुकता। Analytics के
+        queued writer जैसा ही pattern।
+        """
+        if getattr(self, '_writer_thread', None) is None:
+            self._write_q: queue.Queue = queue.Queue()
+            self._writer_thread = threading.Thread(target=self._drain_writes, daemon=True)
+            self._writer_thread.start()
+            atexit.register(self._flush_writes)
+
+    def _drain_writes(self):
+        while True:
+            batch = [self._write_q.get()]
+            while not self._write_q.empty() and len(batch) < WRITE_BATCH_SIZE:
+                batch.append(self._write_q.get_nowait())
+            self._apply_writes(batch)
+
+    def _apply_writes(self, batch):
+        try:
+            news_entries = [item[1] for item in batch if item[0] == 'news']
+            if news_entries:
+                self.save_news_entries_bulk(news_entries)
+
+            for kind, args in batch:
+                if kind == 'user':
+                    self.add_user(*args)
+        except Exception as e:
+            logger.error(f"Error applying queued writes: {e}")
+
+    def _flush_writes(self):
+        """Process exit पर pending queued writes apply करता है"""
+        batch = []
+        while not self._write_q.empty():
+            batch.append(self._write_q.get_nowait())
+        if batch:
+            self._apply_writes(batch)
+
+    def add_user_async(self, user_id: int, username: str = None,
+                       first_name: str = None, last_name: str = None):
+        """add_user का non-blocking version - row queue होकर background में लिखती है"""
+        self._ensure_writer()
+        self._write_q.put_nowait(('user', (user_id, username, first_name, last_name)))
+
+    def save_news_entry_async(self, user_id: int, original_news: str, enhanced_news: str,
+                              category: str = None, processing_time: float = None):
+        """save_news_entry का non-blocking version
+
+        Caller तुरंत लौटता है; writer thread consecutive entries को
+        save_news_entries_bulk से एक ही transaction में batch करता है।
+        """
+        self._ensure_writer()
+        self._write_q.put_nowait(
+            ('news', (user_id, original_news, enhanced_news, category, processing_time))
+        )
+
     def add_user(self, user_id: int, username: str = None, first_name: str = None, last_name: str = None):
-        """नया user add करता है या existing को update करता है"""
+        """नया user add करता है या existing को update करता है
+
+        INSERT OR REPLACE DELETE+INSERT करता था - पूरी row rewrite और
+        join_date/total_requests/is_authorized का silent reset। UPSERT
+        सिर्फ बदलने वाले columns touch करता है।
+        """
         with self.lock:
-            with self._get_connection() as conn:
+            with self._tx() as conn:
                 conn.execute('''
-                    INSERT OR REPLACE INTO users 
+                    INSERT INTO users
                     (user_id, username, first_name, last_name, last_activity)
                     VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        username = excluded.username,
+                        first_name = excluded.first_name,
+                        last_name = excluded.last_name,
+                        last_activity = excluded.last_activity
                 ''', (user_id, username, first_name, last_name, datetime.now()))
-                conn.commit()
     
     def save_news_entry(self, user_id: int, original_news: str, enhanced_news: str, 
                        category: str = None, processing_time: float = None):
         """News entry को database में save करता है"""
         with self.lock:
-            with self._get_connection() as conn:
+            with self._tx() as conn:
                 conn.execute('''
-                    INSERT INTO news_entries 
-                    (user_id, original_news, enhanced_news, category, 
+                    INSERT INTO news_entries
+                    (user_id, original_news, enhanced_news, category,
                      original_length, enhanced_length, processing_time)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     user_id, original_news, enhanced_news, category,
                     len(original_news), len(enhanced_news), processing_time
                 ))
-                
+
                 # User की total requests update करें
                 conn.execute('''
                     UPDATE users SET total_requests = total_requests + 1,
                     last_activity = ? WHERE user_id = ?
                 ''', (datetime.now(), user_id))
-                
-                conn.commit()
-    
+
+    def save_news_entries_bulk(self, entries: List[tuple]):
+        """कई news entries को एक ही transaction में insert करता है
+
+        entries: (user_id, original_news, enhanced_news, category,
+        processing_time) tuples। Per-entry commit की जगह एक fsync -
+        बड़े batches पर insert rate का फर्क order-of-magnitude होता है।
+        """
+        if not entries:
+            return
+        with self.lock:
+            with self._tx() as conn:
+                conn.executemany('''
+                    INSERT INTO news_entries
+                    (user_id, original_news, enhanced_news, category,
+                     original_length, enhanced_length, processing_time)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (user_id, original, enhanced, category,
+                     len(original), len(enhanced), processing_time)
+                    for user_id, original, enhanced, category, processing_time in entries
+                ])
+
+                now = datetime.now()
+                conn.executemany('''
+                    UPDATE users SET total_requests = total_requests + 1,
+                    last_activity = ? WHERE user_id = ?
+                ''', [(now, entry[0]) for entry in entries])
+
+
     def save_channel_post(self, post_data: Dict[str, Any]):
         """Channel post details save करता है"""
         with self.lock:
-            with self._get_connection() as conn:
+            with self._tx() as conn:
                 conn.execute('''
-                    INSERT OR REPLACE INTO channel_posts 
+                    INSERT OR REPLACE INTO channel_posts
                     (message_id, chat_id, content, category, post_time)
                     VALUES (?, ?, ?, ?, ?)
                 ''', (
@@ -169,90 +417,128 @@ class Database:
                     post_data.get('category'),
                     post_data['post_time']
                 ))
-                conn.commit()
     
     def get_user_stats(self, user_id: int) -> Dict[str, Any]:
         """User की statistics return करता है"""
         with self._get_connection() as conn:
-            user_data = conn.execute('''
-                SELECT total_requests, join_date, last_activity 
-                FROM users WHERE user_id = ?
-            ''', (user_id,)).fetchone()
-            
-            if not user_data:
+            # चार अलग execute calls की जगह एक ही VDBE program - news
+            # aggregates LEFT JOIN से, rank indexed range-count से और
+            # total_users stats_cache से, सब एक round-trip में
+            row = conn.execute('''
+                SELECT u.total_requests, u.join_date, u.last_activity,
+                       COALESCE(n.cnt, 0) as total_news,
+                       COALESCE(n.improv, 0) as total_improvement,
+                       (SELECT COUNT(*) FROM users
+                        WHERE total_requests > u.total_requests) + 1 as rank,
+                       (SELECT total_users FROM stats_cache WHERE id = 1) as total
+                FROM users u
+                LEFT JOIN (
+                    SELECT user_id, COUNT(*) as cnt,
+                           SUM(enhanced_length - original_length) as improv
+                    FROM news_entries WHERE user_id = ?
+                    GROUP BY user_id
+                ) n USING (user_id)
+                WHERE u.user_id = ?
+            ''', (user_id, user_id)).fetchone()
+
+            if not row:
                 return {}
-            
-            news_stats = conn.execute('''
-                SELECT COUNT(*) as count, 
-                       SUM(enhanced_length - original_length) as total_improvement
-                FROM news_entries WHERE user_id = ?
-            ''', (user_id,)).fetchone()
-            
-            # User rank calculate करें
-            rank = conn.execute('''
-                SELECT COUNT(*) + 1 as rank FROM users 
-                WHERE total_requests > (
-                    SELECT total_requests FROM users WHERE user_id = ?
-                )
-            ''', (user_id,)).fetchone()['rank']
-            
-            total_users = conn.execute('SELECT COUNT(*) FROM users').fetchone()[0]
+
+            rank = row['rank']
+            total_users = row['total']
             percentile = round((1 - rank / total_users) * 100, 1) if total_users > 0 else 0
-            
+
             return {
-                'total_news': news_stats['count'] or 0,
-                'total_improvement': news_stats['total_improvement'] or 0,
-                'join_date': user_data['join_date'],
-                'last_activity': user_data['last_activity'],
+                'total_news': row['total_news'],
+                'total_improvement': row['total_improvement'],
+                'join_date': row['join_date'],
+                'last_activity': row['last_activity'],
                 'user_rank': rank,
                 'percentile': percentile
             }
     
     def update_rate_limit(self, user_id: int):
-        """Rate limit counters update करता है"""
+        """Rate limit counters update करता है
+
+        पहले row fetch + datetime.fromisoformat parsing + अलग UPDATE था;
+        अब window resets SQL के अंदर julianday comparisons से होते हैं -
+        एक statement, कोई Python-side parsing नहीं।
+        """
+        with self.lock:
+            with self._tx() as conn:
+                conn.execute('''
+                    INSERT INTO rate_limits
+                    (user_id, hourly_count, daily_count, last_hour_reset, last_day_reset)
+                    VALUES (?, 1, 1, datetime('now', 'localtime'), datetime('now', 'localtime'))
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        hourly_count = CASE
+                            WHEN (julianday('now', 'localtime') - julianday(last_hour_reset)) * 86400 > 3600
+                            THEN 1 ELSE hourly_count + 1 END,
+                        last_hour_reset = CASE
+                            WHEN (julianday('now', 'localtime') - julianday(last_hour_reset)) * 86400 > 3600
+                            THEN datetime('now', 'localtime') ELSE last_hour_reset END,
+                        daily_count = CASE
+                            WHEN julianday('now', 'localtime') - julianday(last_day_reset) > 1
+                            THEN 1 ELSE daily_count + 1 END,
+                        last_day_reset = CASE
+                            WHEN julianday('now', 'localtime') - julianday(last_day_reset) > 1
+                            THEN datetime('now', 'localtime') ELSE last_day_reset END
+                ''', (user_id,))
+    
+    def check_and_bump_rate_limit(self, user_id: int) -> Dict[str, Any]:
+        """Rate limit counters को एक ही statement में bump करके check करता है
+
+        पहले read + update दो round-trips थे; ON CONFLICT upsert + RETURNING
+        atomically increment करता है और post-update counts वापस देता है।
+        """
         now = datetime.now()
+        hour_cutoff = now - timedelta(hours=1)
+        day_cutoff = now - timedelta(days=1)
+
         with self.lock:
             with self._get_connection() as conn:
-                # Current limits check करें
-                current = conn.execute('''
-                    SELECT * FROM rate_limits WHERE user_id = ?
-                ''', (user_id,)).fetchone()
-                
-                if not current:
-                    # नया entry बनाएं
-                    conn.execute('''
-                        INSERT INTO rate_limits (user_id, hourly_count, daily_count)
-                        VALUES (?, 1, 1)
-                    ''', (user_id,))
-                else:
-                    hour_reset = datetime.fromisoformat(current['last_hour_reset'])
-                    day_reset = datetime.fromisoformat(current['last_day_reset'])
-                    
-                    # Hourly reset check
-                    if now - hour_reset > timedelta(hours=1):
-                        hourly_count = 1
-                        hour_reset_time = now
-                    else:
-                        hourly_count = current['hourly_count'] + 1
-                        hour_reset_time = hour_reset
-                    
-                    # Daily reset check
-                    if now - day_reset > timedelta(days=1):
-                        daily_count = 1
-                        day_reset_time = now
-                    else:
-                        daily_count = current['daily_count'] + 1
-                        day_reset_time = day_reset
-                    
-                    conn.execute('''
-                        UPDATE rate_limits SET 
-                        hourly_count = ?, daily_count = ?,
-                        last_hour_reset = ?, last_day_reset = ?
-                        WHERE user_id = ?
-                    ''', (hourly_count, daily_count, hour_reset_time, day_reset_time, user_id))
-                
+                row = conn.execute('''
+                    INSERT INTO rate_limits
+                    (user_id, hourly_count, daily_count, last_hour_reset, last_day_reset)
+                    VALUES (?, 1, 1, ?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        hourly_count = CASE WHEN last_hour_reset < ?
+                                            THEN 1 ELSE hourly_count + 1 END,
+                        last_hour_reset = CASE WHEN last_hour_reset < ?
+                                               THEN ? ELSE last_hour_reset END,
+                        daily_count = CASE WHEN last_day_reset < ?
+                                           THEN 1 ELSE daily_count + 1 END,
+                        last_day_reset = CASE WHEN last_day_reset < ?
+                                              THEN ? ELSE last_day_reset END
+                    RETURNING hourly_count, daily_count
+                ''', (user_id, now, now,
+                      hour_cutoff, hour_cutoff, now,
+                      day_cutoff, day_cutoff, now)).fetchone()
                 conn.commit()
-    
+
+                return {
+                    "hourly_ok": row['hourly_count'] <= config.MAX_REQUESTS_PER_HOUR,
+                    "daily_ok": row['daily_count'] <= config.MAX_REQUESTS_PER_DAY,
+                    "hourly_count": row['hourly_count'],
+                    "daily_count": row['daily_count']
+                }
+
+    def flush_rate_limits(self, rows: List[tuple]):
+        """In-memory rate limit buckets को एक batch में DB flush करता है"""
+        with self.lock:
+            with self._get_connection() as conn:
+                conn.executemany('''
+                    INSERT INTO rate_limits
+                    (user_id, hourly_count, daily_count, last_hour_reset, last_day_reset)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        hourly_count = excluded.hourly_count,
+                        daily_count = excluded.daily_count,
+                        last_hour_reset = excluded.last_hour_reset,
+                        last_day_reset = excluded.last_day_reset
+                ''', rows)
+                conn.commit()
+
     def check_rate_limit(self, user_id: int) -> Dict[str, bool]:
         """Rate limit status check करता है"""
         with self._get_connection() as conn:
@@ -268,11 +554,17 @@ class Database:
                 "daily_ok": limits['daily_count'] < config.MAX_REQUESTS_PER_DAY
             }
     
-    def get_top_users(self, limit: int = 10) -> List[Dict]:
-        """Top users की list return करता है"""
+    def get_top_users(self, limit: int = 10) -> List[tuple]:
+        """Top users की list return करता है
+
+        (user_id, username, total_requests, news_count) tuples - per-row
+        sqlite3.Row + dict() allocation छोड़कर सीधे C-level tuples।
+        """
         with self._get_connection() as conn:
-            users = conn.execute('''
-                SELECT user_id, username, total_requests, 
+            cur = conn.cursor()
+            cur.row_factory = None
+            return cur.execute('''
+                SELECT u.user_id, u.username, u.total_requests,
                        COUNT(ne.id) as news_count
                 FROM users u
                 LEFT JOIN news_entries ne ON u.user_id = ne.user_id
@@ -281,29 +573,49 @@ class Database:
                 ORDER BY total_requests DESC
                 LIMIT ?
             ''', (limit,)).fetchall()
-            
-            return [dict(user) for user in users]
     
     def get_daily_stats(self, date: str = None) -> Dict[str, Any]:
-        """Daily statistics return करता है"""
+        """Daily statistics return करता है
+
+        बीते दिन daily_rollup से O(1) में आते हैं; rollup ना मिलने पर
+        (आज का in-progress दिन) live aggregation चलती है।
+        """
         if not date:
             date = datetime.now().strftime('%Y-%m-%d')
-            
+
+        with self._get_connection() as conn:
+            row = conn.execute('''
+                SELECT date, active_users, total_news, avg_improvement, total_posts
+                FROM daily_rollup WHERE date = ?
+            ''', (date,)).fetchone()
+
+            if row:
+                return dict(row)
+
+        return self._compute_daily_stats(date)
+
+    def _compute_daily_stats(self, date: str) -> Dict[str, Any]:
+        """Date के daily aggregates live compute करता है"""
+        # Half-open range predicate - SQLite DATE() function के आर-पार
+        # index use नहीं कर सकता, सीधी comparison से idx_news_created/
+        # idx_posts_time probe होते हैं
+        next_date = (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
         with self._get_connection() as conn:
             stats = conn.execute('''
-                SELECT 
+                SELECT
                     COUNT(DISTINCT user_id) as active_users,
                     COUNT(*) as total_news,
                     AVG(enhanced_length - original_length) as avg_improvement
-                FROM news_entries 
-                WHERE DATE(created_at) = ?
-            ''', (date,)).fetchone()
-            
+                FROM news_entries
+                WHERE created_at >= ? AND created_at < ?
+            ''', (date, next_date)).fetchone()
+
             posts = conn.execute('''
                 SELECT COUNT(*) as total_posts
-                FROM channel_posts 
-                WHERE DATE(post_time) = ?
-            ''', (date,)).fetchone()
+                FROM channel_posts
+                WHERE post_time >= ? AND post_time < ?
+            ''', (date, next_date)).fetchone()
             
             return {
                 "date": date,
@@ -312,13 +624,113 @@ class Database:
                 "avg_improvement": round(stats['avg_improvement'] or 0, 2),
                 "total_posts": posts['total_posts'] or 0
             }
-    
+
+    def roll_daily(self, date: str = None):
+        """एक दिन के aggregates को daily_rollup में materialize करता है
+
+        Scheduler रोज़ 00:05 पर बीते दिन के लिए call करता है; उसके बाद
+        उस date के get_daily_stats reads single-row lookups बन जाते हैं।
+        """
+        if not date:
+            date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+
+        stats = self._compute_daily_stats(date)
+        with self.lock:
+            with self._tx() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO daily_rollup
+                    (date, active_users, total_news, avg_improvement, total_posts)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (date, stats['active_users'], stats['total_news'],
+                      stats['avg_improvement'], stats['total_posts']))
+        logger.info(f"Daily rollup materialized for {date}")
+
+
+    def get_range_stats(self, start_date: str, end_date: str) -> Dict[str, Dict[str, Any]]:
+        """Date range की daily statistics एक ही query में return करता है"""
+        # WHERE में half-open range रखें ताकि indexes use हों; GROUP BY
+        # में DATE() ठीक है - वो filtered rows पर ही चलता है
+        end_exclusive = (datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+        with self._get_connection() as conn:
+            stats = conn.execute('''
+                SELECT
+                    DATE(created_at) as date,
+                    COUNT(DISTINCT user_id) as active_users,
+                    COUNT(*) as total_news,
+                    AVG(enhanced_length - original_length) as avg_improvement
+                FROM news_entries
+                WHERE created_at >= ? AND created_at < ?
+                GROUP BY DATE(created_at)
+            ''', (start_date, end_exclusive)).fetchall()
+
+            posts = conn.execute('''
+                SELECT DATE(post_time) as date, COUNT(*) as total_posts
+                FROM channel_posts
+                WHERE post_time >= ? AND post_time < ?
+                GROUP BY DATE(post_time)
+            ''', (start_date, end_exclusive)).fetchall()
+
+            posts_by_date = {post['date']: post['total_posts'] for post in posts}
+
+            result = {}
+            for stat in stats:
+                result[stat['date']] = {
+                    "date": stat['date'],
+                    "active_users": stat['active_users'] or 0,
+                    "total_news": stat['total_news'] or 0,
+                    "avg_improvement": round(stat['avg_improvement'] or 0, 2),
+                    "total_posts": posts_by_date.get(stat['date'], 0)
+                }
+
+            # सिर्फ posts वाले दिन भी include करें
+            for date, total_posts in posts_by_date.items():
+                if date not in result:
+                    result[date] = {
+                        "date": date,
+                        "active_users": 0,
+                        "total_news": 0,
+                        "avg_improvement": 0,
+                        "total_posts": total_posts
+                    }
+
+            return result
+
+    def get_cached_ai_news(self, news_hash: bytes) -> Optional[Dict[str, Any]]:
+        """Content hash से cached AI-enhanced news return करता है"""
+        with self._get_connection() as conn:
+            row = conn.execute('''
+                SELECT enhanced, category FROM ai_cache WHERE hash = ?
+            ''', (news_hash,)).fetchone()
+
+            if not row:
+                return None
+            return {"enhanced": row['enhanced'], "category": row['category']}
+
+    def cache_ai_news(self, news_hash: bytes, category: str, enhanced: str):
+        """AI-enhanced news को hash के against cache करता है"""
+        with self.lock:
+            with self._tx() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO ai_cache (hash, category, enhanced)
+                    VALUES (?, ?, ?)
+                ''', (news_hash, category, enhanced))
+
     def backup_database(self, backup_path: str) -> bool:
-        """Database का backup बनाता है"""
+        """Database का backup बनाता है
+
+        shutil.copy2 WAL mode में uncheckpointed pages miss कर सकता था;
+        SQLite का online backup API live writers के साथ भी consistent
+        page-granular copy देता है।
+        """
         try:
-            import shutil
             backup_file = f"{backup_path}/backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-            shutil.copy2(self.db_name, backup_file)
+            dst = sqlite3.connect(backup_file)
+            try:
+                with dst:
+                    self._get_connection().backup(dst, pages=1024)
+            finally:
+                dst.close()
             logger.info(f"Database backup created: {backup_file}")
             return True
         except Exception as e:
@@ -343,12 +755,25 @@ class Database:
                 conn.commit()
                 logger.info(f"Cleaned up data older than {days} days")
     
-    def get_active_subscribers(self) -> List[int]:
-        """Active subscribers की list return करता है"""
+    def get_active_subscribers(self) -> array:
+        """Active subscribers की IDs return करता है
+
+        List of Row objects की जगह contiguous array('q') - fanout वाले
+        callers int objects की list के बिना iterate कर सकते हैं।
+        Broadcast fanout periodic है इसलिए result 60s TTL से cached है।
+        """
+        cached = getattr(self, '_subs_cache', None)
+        if cached and time.monotonic() - cached[0] < 60:
+            return cached[1]
+
         with self._get_connection() as conn:
-            subscribers = conn.execute('''
-                SELECT user_id FROM users 
-                WHERE is_active = TRUE AND is_authorized = TRUE
-            ''').fetchall()
-            
-            return [sub['user_id'] for sub in subscribers]
\ No newline at end of file
+            cur = conn.cursor()
+            cur.row_factory = None
+            subs = array('q', (row[0] for row in cur.execute('''
+                SELECT user_id FROM users
+                WHERE is_active = 1 AND is_authorized = 1
+            ''')))
+
+        self._subs_cache = (time.monotonic(), subs)
+        return subs
+
@@ -33,25 +33,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class NewsBot:
-    def __init__(self):
-        self.db = Database()
-        self.news_processor = NewsProcessor()
-        self.channel_manager = ChannelManager()
-        self.auth_manager = AuthManager()
-        self.admin_commands = AdminCommands()
-        self.analytics = Analytics()
-        self.scheduler = NewsScheduler()
-        
-    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Start command handler"""
-        user_id = update.effective_user.id
-        username = update.effective_user.username
-        
-        # User ko database mein add karo
-        self.db.add_user(user_id, username)
-        
-        welcome_text = """
+# Static texts और keyboards import पर एक बार बनते हैं - हर update पर
+# InlineKeyboardMarkup/multi-line string allocation ना हो
+_WELCOME_TEXT = """
 🔥 **News AI Bot में आपका स्वागत है!** 🔥
 
 📰 **क्या करता है यह बॉट:**
@@ -73,15 +57,84 @@ class NewsBot:
 🔐 **Admin Commands:**
 /admin - Admin panel (केवल authorized users)
 """
+
+_START_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Stats", callback_data="stats")],
+    [InlineKeyboardButton("⚙️ Settings", callback_data="settings")],
+    [InlineKeyboardButton("❓ Help", callback_data="help")]
+])
+
+_SUCCESS_TEMPLATE = """
+✅ **News successfully processed और post हो गई!**
+
+📝 **Original Length:** {orig_len} characters
+📝 **Improved Length:** {enh_len} characters
+📈 **Improvement:** {diff} characters added
+
+🔗 **Channel Link:** """ + config.CHANNEL_LINK + "\n"
+
+_SUCCESS_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 View Stats", callback_data="stats")],
+    [InlineKeyboardButton("🔄 Process Another", callback_data="process_another")]
+])
+
+_STATS_TEMPLATE = """
+📊 **आपकी Statistics:**
+
+📰 Total News Processed: {total_news}
+📈 Characters Added: {total_improvement}
+🕒 Last Activity: {last_activity}
+📅 Member Since: {join_date}
+
+🏆 **आपका Rank:** #{user_rank} (Top {percentile}%)
+"""
+
+_SETTINGS_TEXT = """
+⚙️ **Settings:**
+
+🌐 Language: Hindi (Default)
+📊 Analytics: Enabled
+🔔 Notifications: Enabled
+🕒 Auto-post Time: Immediate
+
+💡 Contact admin to change settings.
+"""
+
+_HELP_TEXT = """
+❓ **Help Guide:**
+
+📝 **News भेजने का तरीका:**
+1. सिर्फ news text type करके भेजें
+2. कोई command की जरूरत नहीं
+3. Bot automatically process करेगा
+
+🎯 **Best Results के लिए:**
+• Clear और complete news भेजें
+• Facts include करें
+• Minimum 50 characters का news भेजें
+
+📞 **Support:** @youradmin
+"""
+
+class NewsBot:
+    def __init__(self):
+        self.db = Database()
+        self.news_processor = NewsProcessor()
+        self.channel_manager = ChannelManager()
+        self.auth_manager = AuthManager()
+        self.admin_commands = AdminCommands()
+        self.analytics = Analytics()
+        self.scheduler = NewsScheduler()
         
-        keyboard = [
-            [InlineKeyboardButton("📊 Stats", callback_data="stats")],
-            [InlineKeyboardButton("⚙️ Settings", callback_data="settings")],
-            [InlineKeyboardButton("❓ Help", callback_data="help")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Start command handler"""
+        user_id = update.effective_user.id
+        username = update.effective_user.username
         
-        await update.message.reply_text(welcome_text, reply_markup=reply_markup, parse_mode='Markdown')
+        # User ko database mein add karo - queued write, handler block नहीं होता
+        self.db.add_user_async(user_id, username)
+        
+        await update.message.reply_text(_WELCOME_TEXT, reply_markup=_START_MARKUP, parse_mode='Markdown')
         
         # Analytics update
         self.analytics.log_user_action(user_id, "start_command")
@@ -108,27 +161,18 @@ class NewsBot:
             post_result = await self.channel_manager.post_to_channel(processed_news)
             
             if post_result:
-                # Database में save करें
-                self.db.save_news_entry(user_id, original_news, processed_news)
-                
-                # Success message
-                success_text = f"""
-✅ **News successfully processed और post हो गई!**
-
-📝 **Original Length:** {len(original_news)} characters
-📝 **Improved Length:** {len(processed_news)} characters
-📈 **Improvement:** {len(processed_news) - len(original_news)} characters added
-
-🔗 **Channel Link:** {config.CHANNEL_LINK}
-"""
+                # Database में save करें - background writer में queue होता
+                # है ताकि success edit fsync का wait ना करे
+                self.db.save_news_entry_async(user_id, original_news, processed_news)
                 
-                keyboard = [
-                    [InlineKeyboardButton("📊 View Stats", callback_data="stats")],
-                    [InlineKeyboardButton("🔄 Process Another", callback_data="process_another")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                await processing_msg.edit_text(success_text, reply_markup=reply_markup, parse_mode='Markdown')
+                # Success message - सिर्फ per-request integers interpolate होते हैं
+                success_text = _SUCCESS_TEMPLATE.format(
+                    orig_len=len(original_news),
+                    enh_len=len(processed_news),
+                    diff=len(processed_news) - len(original_news)
+                )
+
+                await processing_msg.edit_text(success_text, reply_markup=_SUCCESS_MARKUP, parse_mode='Markdown')
                 
                 # Analytics
                 self.analytics.log_news_processed(user_id, len(original_news), len(processed_news))
@@ -150,48 +194,13 @@ class NewsBot:
         
         if data == "stats":
             stats = self.analytics.get_user_stats(user_id)
-            stats_text = f"""
-📊 **आपकी Statistics:**
-
-📰 Total News Processed: {stats['total_news']}
-📈 Characters Added: {stats['total_improvement']}
-🕒 Last Activity: {stats['last_activity']}
-📅 Member Since: {stats['join_date']}
+            await query.edit_message_text(_STATS_TEMPLATE.format_map(stats), parse_mode='Markdown')
 
-🏆 **आपका Rank:** #{stats['user_rank']} (Top {stats['percentile']}%)
-"""
-            await query.edit_message_text(stats_text, parse_mode='Markdown')
-            
         elif data == "settings":
-            settings_text = """
-⚙️ **Settings:**
+            await query.edit_message_text(_SETTINGS_TEXT, parse_mode='Markdown')
 
-🌐 Language: Hindi (Default)
-📊 Analytics: Enabled
-🔔 Notifications: Enabled
-🕒 Auto-post Time: Immediate
-
-💡 Contact admin to change settings.
-"""
-            await query.edit_message_text(settings_text, parse_mode='Markdown')
-            
         elif data == "help":
-            help_text = """
-❓ **Help Guide:**
-
-📝 **News भेजने का तरीका:**
-1. सिर्फ news text type करके भेजें
-2. कोई command की जरूरत नहीं
-3. Bot automatically process करेगा
-
-🎯 **Best Results के लिए:**
-• Clear और complete news भेजें
-• Facts include करें
-• Minimum 50 characters का news भेजें
-
-📞 **Support:** @youradmin
-"""
-            await query.edit_message_text(help_text, parse_mode='Markdown')
+            await query.edit_message_text(_HELP_TEXT, parse_mode='Markdown')
 
     async def admin_panel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Admin panel access"""
@@ -1,19 +1,60 @@
 # news_processor.py - AI News Enhancement Module
 import openai
 import asyncio
+import functools
+import hashlib
 import logging
+import re
+import time
+from datetime import datetime
 from typing import Optional, Dict, Any
 import config
+from database import Database
 from rate_limiter import RateLimiter
 from categorizer import NewsCategori
 
 logger = logging.getLogger(__name__)
 
 class NewsProcessor:
+    # Formatting regexes एक बार compile होते हैं - Python line loop की
+    # जगह पूरे text पर C-level pass
+    _BLANK_RE = re.compile(r'[ \t]*\n\s*')
+    _HEADING_RE = re.compile(r'^(.{0,48}[:।])$', re.MULTILINE)
+
+    # Category prompt tables class load पर एक बार बनते हैं - हर call पर
+    # dict rebuild और f-string formatting नहीं
+    _CATEGORY_CONTEXT = {
+        "🏛️ Politics": "राजनीतिक संदर्भ और background add करें",
+        "💰 Business": "आर्थिक impact और market context add करें",
+        "⚽ Sports": "खेल के rules और player stats add करें",
+        "🎬 Entertainment": "Celebrity background और industry context add करें",
+        "🔬 Technology": "Technical details और future implications add करें",
+        "🌍 International": "Global context और diplomatic angles add करें",
+        "🏥 Health": "Medical context और safety guidelines add करें",
+        "🎓 Education": "Educational impact और policy context add करें",
+        "🌦️ Weather": "Scientific explanation और safety measures add करें",
+        "🚨 Breaking": "Immediate impact और urgent context add करें"
+    }
+    _CATEGORY_PROMPT_SUFFIX = {
+        cat: f"\n\nCategory: {cat}\nSpecial Focus: {ctx}\n\nEnhanced News:\n"
+        for cat, ctx in _CATEGORY_CONTEXT.items()
+    }
+    # (emoji, label) pairs - हर call पर category.split() दो बार ना चले
+    _CAT_PARTS = {cat: tuple(cat.split(maxsplit=1)) for cat in _CATEGORY_CONTEXT}
+
     def __init__(self):
-        openai.api_key = config.OPENAI_API_KEY
+        # Async client - blocking call को thread में wrap करने की जगह
+        # requests सीधे event loop पर multiplex होती हैं
+        self._aclient = openai.AsyncOpenAI(api_key=config.OPENAI_API_KEY)
         self.rate_limiter = RateLimiter()
         self.categorizer = NewsCategori()
+        self.db = Database()
+        # Content-hash keyed hot cache - same news दोबारा आने पर सबसे
+        # महंगा step (OpenAI call) पूरी तरह skip हो जाता है
+        self._mem_cache: Dict[bytes, Dict[str, str]] = {}
+        # Single-flight: same news के concurrent calls में पहला ही API
+        # call करता है, बाकी उसी Future का await करते हैं
+        self._inflight: Dict[bytes, asyncio.Future] = {}
         
     async def enhance_news(self, original_news: str, user_id: int = None) -> Dict[str, Any]:
         """
@@ -29,15 +70,44 @@ class NewsProcessor:
             if user_id and not self.rate_limiter.check_rate_limit(user_id):
                 raise Exception("Rate limit exceeded")
             
-            # News category detect करें
-            category = self.categorizer.detect_category(original_news)
-            
-            # AI prompt prepare करें
-            enhanced_prompt = self._prepare_ai_prompt(original_news, category)
-            
-            # OpenAI API call
-            enhanced_news = await self._call_openai_api(enhanced_prompt)
-            
+            # Cache check - memory पहले, फिर persistent ai_cache table
+            news_hash = hashlib.blake2b(original_news.encode(), digest_size=16).digest()
+            cached = self._mem_cache.get(news_hash) or self.db.get_cached_ai_news(news_hash)
+
+            if cached:
+                category = cached['category']
+                enhanced_news = cached['enhanced']
+            elif (inflight := self._inflight.get(news_hash)) is not None:
+                # कोई और call same news पहले से enhance कर रही है -
+                # दूसरा API call ना करके उसी result का wait करें
+                category, enhanced_news = await inflight
+            else:
+                fut = asyncio.get_running_loop().create_future()
+                self._inflight[news_hash] = fut
+                try:
+                    # News category detect करें
+                    category = self.categorizer.detect_category(original_news)
+
+                    # AI prompt prepare करें
+                    enhanced_prompt = self._prepare_ai_prompt(original_news, category)
+
+                    # OpenAI API call
+                    enhanced_news = await self._call_openai_api(enhanced_prompt)
+
+                    # दोनों cache layers में store करें
+                    if len(self._mem_cache) > 1024:
+                        self._mem_cache.clear()
+                    self._mem_cache[news_hash] = {"enhanced": enhanced_news, "category": category}
+                    self.db.cache_ai_news(news_hash, category, enhanced_news)
+
+                    fut.set_result((category, enhanced_news))
+                except Exception as e:
+                    fut.set_exception(e)
+                    raise
+                finally:
+                    self._inflight.pop(news_hash, None)
+
+
             # Post-processing
             final_news = self._post_process_news(enhanced_news, category)
             
@@ -73,44 +143,26 @@ class NewsProcessor:
         return True
     
     def _prepare_ai_prompt(self, original_news: str, category: str) -> str:
-        """AI के लिए prompt prepare करता है"""
-        category_context = {
-            "🏛️ Politics": "राजनीतिक संदर्भ और background add करें",
-            "💰 Business": "आर्थिक impact और market context add करें", 
-            "⚽ Sports": "खेल के rules और player stats add करें",
-            "🎬 Entertainment": "Celebrity background और industry context add करें",
-            "🔬 Technology": "Technical details और future implications add करें",
-            "🌍 International": "Global context और diplomatic angles add करें",
-            "🏥 Health": "Medical context और safety guidelines add करें",
-            "🎓 Education": "Educational impact और policy context add करें",
-            "🌦️ Weather": "Scientific explanation और safety measures add करें",
-            "🚨 Breaking": "Immediate impact और urgent context add करें"
-        }
-        
-        category_instruction = category_context.get(category, "General context add करें")
-        
-        prompt = f"""
-{config.AI_PROMPT_TEMPLATE}
+        """AI के लिए prompt prepare करता है
 
-Category: {category}
-Special Focus: {category_instruction}
-
-Original News: {original_news}
+        Template pieces precomputed हैं - hot path पर सिर्फ concatenation।
+        """
+        suffix = self._CATEGORY_PROMPT_SUFFIX.get(category)
+        if suffix is None:
+            # Unknown category (जैसे "🔔 General") - suffix on the fly
+            suffix = f"\n\nCategory: {category}\nSpecial Focus: General context add करें\n\nEnhanced News:\n"
 
-Enhanced News:
-"""
-        return prompt
+        return "\n" + config.build_ai_prompt(original_news) + suffix
     
     async def _call_openai_api(self, prompt: str) -> str:
         """OpenAI API call with error handling"""
         try:
             response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    openai.ChatCompletion.create,
+                self._aclient.chat.completions.create(
                     model=config.AI_MODEL,
                     messages=[
                         {
-                            "role": "system", 
+                            "role": "system",
                             "content": "आप एक professional news writer हैं। आपका काम news को enhance करना है।"
                         },
                         {"role": "user", "content": prompt}
@@ -130,37 +182,43 @@ Enhanced News:
             logger.error(f"OpenAI API error: {e}")
             raise Exception("AI processing failed")
     
+    @staticmethod
+    @functools.lru_cache(maxsize=2)
+    def _format_timestamp(minute: int) -> str:
+        """Minute granularity पर cached timestamp string
+
+        strftime महंगा है और display minute तक ही precise है - एक ही
+        minute की सारी requests एक ही formatted string reuse करती हैं।
+        """
+        return datetime.now().strftime("%d %B %Y, %I:%M %p")
+
     def _post_process_news(self, enhanced_news: str, category: str) -> str:
         """Post-processing enhanced news"""
-        # Category emoji add करें
-        if not enhanced_news.startswith(category.split()[0]):
-            enhanced_news = f"{category.split()[0]} **{category.split()[1]}**\n\n{enhanced_news}"
-        
+        # Category emoji add करें - precomputed (emoji, label) से
+        parts = self._CAT_PARTS.get(category)
+        if parts is None:
+            parts = tuple(category.split(maxsplit=1))
+        emoji, label = parts if len(parts) == 2 else (parts[0], parts[0])
+
+        if not enhanced_news.startswith(emoji):
+            enhanced_news = f"{emoji} **{label}**\n\n{enhanced_news}"
+
         # Formatting improvements
         enhanced_news = self._improve_formatting(enhanced_news)
-        
+
         # Add timestamp
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%d %B %Y, %I:%M %p")
-        enhanced_news += f"\n\n📅 *Updated: {timestamp}*"
-        
-        return enhanced_news
+        timestamp = self._format_timestamp(int(time.time() // 60))
+        return f"{enhanced_news}\n\n📅 *Updated: {timestamp}*"
     
     def _improve_formatting(self, text: str) -> str:
-        """Text formatting improve करता है"""
-        # Basic formatting improvements
-        lines = text.split('\n')
-        formatted_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line:
-                # Headings को bold बनाएं
-                if len(line) < 50 and line.endswith((':','।')):
-                    line = f"**{line}**"
-                formatted_lines.append(line)
-        
-        return '\n\n'.join(formatted_lines)
+        """Text formatting improve करता है
+
+        पहले per-line Python loop था; अब दो precompiled re.sub passes -
+        newline runs को '\\n\\n' में collapse करो (side whitespace समेत),
+        फिर 50 characters से छोटी ':'/'।' ending lines bold करो।
+        """
+        text = self._BLANK_RE.sub('\n\n', text.strip())
+        return self._HEADING_RE.sub(r'**\1**', text)
     
     def _calculate_metrics(self, original: str, enhanced: str) -> Dict[str, Any]:
         """News enhancement metrics calculate करता है"""
@@ -173,11 +231,15 @@ Enhanced News:
         }
     
     async def bulk_enhance_news(self, news_list: list, user_id: int = None) -> list:
-        """Multiple news items को एक साथ enhance करता है"""
-        results = []
-        for news in news_list:
-            result = await self.enhance_news(news, user_id)
-            results.append(result)
-            # Rate limiting के लिए delay
-            await asyncio.sleep(1)
-        return results
\ No newline at end of file
+        """Multiple news items को एक साथ enhance करता है
+
+        Sequential loop + sleep की जगह bounded concurrency - सारे items
+        एक साथ in-flight रहते हैं, semaphore API को flood नहीं होने देता।
+        """
+        semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_AI)
+
+        async def _enhance_one(news: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.enhance_news(news, user_id)
+
+        return await asyncio.gather(*(_enhance_one(news) for news in news_list))
\ No newline at end of file
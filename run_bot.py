@@ -8,21 +8,34 @@ Telegram News AI Bot
 import os
 import sys
 import logging
+from importlib.util import find_spec
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from pathlib import Path
 
 # Add current directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
 def setup_logging():
-    """Enhanced logging setup"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('bot.log', encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
+    """Enhanced logging setup
+
+    bot.log rotate होता है (10MB x 5) ताकि disk unbounded ना भरे, और
+    MemoryHandler INFO lines buffer करके WARNING+ पर flush करता है -
+    INFO bursts में per-line file syscall नहीं होता।
+    """
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    file_handler = RotatingFileHandler(
+        'bot.log', maxBytes=10_485_760, backupCount=5, encoding='utf-8'
     )
+    file_handler.setFormatter(formatter)
+    buffered_handler = MemoryHandler(
+        capacity=1000, flushLevel=logging.WARNING, target=file_handler
+    )
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    logging.basicConfig(level=logging.INFO, handlers=[buffered_handler, stream_handler])
 
 def check_requirements():
     """Check if all required packages are installed"""
@@ -30,13 +43,10 @@ def check_requirements():
         'telegram', 'openai', 'schedule', 'psutil', 'dotenv'
     ]
     
-    missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
-    
+    # find_spec सिर्फ filesystem check करता है - __import__ की तरह
+    # telegram/openai का पूरा import graph execute नहीं होता
+    missing_packages = [p for p in required_packages if find_spec(p) is None]
+
     if missing_packages:
         print(f"❌ Missing packages: {', '.join(missing_packages)}")
         print("📦 Install करें: pip install python-telegram-bot openai schedule psutil python-dotenv")
@@ -57,12 +67,15 @@ def check_config():
             'ADMIN_USER_IDS'
         ]
         
-        missing_settings = []
-        for setting in required_settings:
-            value = getattr(config, setting, None)
-            if not value or (isinstance(value, str) and 'YOUR_' in value.upper()):
-                missing_settings.append(setting)
-        
+        # Module dict एक बार पढ़ें - per-setting getattr और .upper()
+        # allocation की जरूरत नहीं (placeholders 'YOUR_' से ही शुरू होते हैं)
+        cfg = vars(config)
+        missing_settings = [
+            setting for setting in required_settings
+            if not cfg.get(setting)
+            or (isinstance(cfg[setting], str) and cfg[setting].startswith('YOUR_'))
+        ]
+
         if missing_settings:
             print(f"❌ Missing configuration: {', '.join(missing_settings)}")
             print("⚙️ कृपया config.py में proper values set करें")
@@ -76,9 +89,11 @@ def check_config():
 
 def create_directories():
     """Create required directories"""
-    directories = ['backups', 'logs']
-    for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
+    # isdir check मौजूदा dirs के लिए mkdir syscall skip करता है; os.makedirs
+    # direct call है - per-dir Path object नहीं बनता
+    for directory in ('backups', 'logs'):
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
 
 def main():
     """Main function to start the bot"""
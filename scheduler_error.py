@@ -1,28 +1,135 @@
 # scheduler.py - News Scheduling Module
 import asyncio
 import logging
+import sqlite3
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import schedule
 import threading
+from telegram.error import RetryAfter
 from database import Database
 from channel_manager import ChannelManager
 import config
 
 logger = logging.getLogger(__name__)
 
+# Hot statements के SQL text module-level constants हैं - हर call पर वही
+# object pass होने से SQLite का per-connection statement cache warm रहता
+# है (text बदलते ही re-parse/re-plan होता)
+_SQL_PENDING_POSTS = '''
+    SELECT * FROM scheduled_posts
+    WHERE status = 'pending'
+    AND scheduled_time <= ?
+    ORDER BY scheduled_time ASC
+    LIMIT 5
+'''
+_SQL_INSERT_POST = '''
+    INSERT INTO scheduled_posts (content, scheduled_time, status)
+    VALUES (?, ?, 'pending')
+'''
+_SQL_MARK_POSTED = '''
+    UPDATE scheduled_posts
+    SET status = 'posted', posted_at = ?, message_id = ?
+    WHERE id = ?
+'''
+_SQL_CANCEL_POST = '''
+    UPDATE scheduled_posts
+    SET status = 'cancelled'
+    WHERE id = ? AND status = 'pending'
+'''
+
+class TelegramLimiter:
+    """Outgoing Telegram sends का shared rate limiter
+
+    Semaphore concurrency cap रखता है और RetryAfter (429) आने पर सारे
+    senders एक shared Event पर रुक जाते हैं - piecemeal retries की जगह
+    global back-pressure।
+    """
+    def __init__(self, max_concurrent: int = 25):
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self._ok = asyncio.Event()
+        self._ok.set()
+
+    async def __aenter__(self):
+        await self._ok.wait()
+        await self._sem.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._sem.release()
+        return False
+
+    async def throttle(self, seconds: float):
+        """RetryAfter मिलने पर सब senders को रोककर wait करता है"""
+        if self._ok.is_set():
+            self._ok.clear()
+            await asyncio.sleep(seconds)
+            self._ok.set()
+        else:
+            # कोई और पहले से throttle कर रहा है - resume का wait करो
+            await self._ok.wait()
+
+# asyncio Semaphore/Event loop-affine होते हैं - error_handler PTB के
+# application loop पर चलता है और scheduler coroutines अपने private loop
+# पर, इसलिए हर loop का अपना limiter instance (shared instance दूसरे loop
+# से wake/set पर deadlock/RuntimeError देता)
+_limiters: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def _get_limiter() -> TelegramLimiter:
+    """Current running loop का TelegramLimiter return करता है"""
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = TelegramLimiter()
+        _limiters[loop] = limiter
+    return limiter
+
+async def _send_limited(bot, chat_id, text, parse_mode='Markdown') -> bool:
+    """Limiter के through message भेजता है, RetryAfter पर एक retry"""
+    limiter = _get_limiter()
+    for _ in range(2):
+        async with limiter:
+            try:
+                await bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode)
+                return True
+            except RetryAfter as e:
+                await limiter.throttle(e.retry_after)
+            except Exception as e:
+                logger.error(f"Failed to send to {chat_id}: {e}")
+                return False
+    return False
+
 class NewsScheduler:
     def __init__(self):
         self.db = Database()
         self.channel_manager = ChannelManager()
         self.running = False
         self.scheduler_thread = None
+        self._stop_event = threading.Event()
+        self._loop = None
+        self._loop_thread = None
+        # बीती dates के daily stats immutable हैं - एक बार पढ़कर cache
+        self._stats_cache: Dict[str, Dict[str, Any]] = {}
     
     def start(self):
         """Scheduler start करता है"""
         if not self.running:
             self.running = True
-            
+            self._stop_event.clear()
+
+            # Async tasks के लिए एक ही persistent loop - हर fire पर नया
+            # event loop (selectors, executor) बनाना-गिराना नहीं पड़ता
+            self._loop = asyncio.new_event_loop()
+            # Default executor min(32, cpu*5) workers तक बढ़ता है - इस
+            # workload (दिन में गिनती के posts) के लिए 4 काफी हैं
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sched')
+            self._loop.set_default_executor(self._executor)
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
+
+
             # Schedule daily auto posts
             for time_str in config.AUTO_POST_TIMES:
                 schedule.every().day.at(time_str).do(self._run_async, self.auto_post_news)
@@ -33,6 +140,9 @@ class NewsScheduler:
                     self._run_async, self.send_daily_report
                 )
             
+            # Schedule daily stats rollup (बीते दिन का materialized aggregate)
+            schedule.every().day.at("00:05").do(self._roll_daily_stats)
+
             # Schedule database cleanup (weekly)
             schedule.every().monday.at("02:00").do(self._cleanup_database)
             
@@ -50,74 +160,94 @@ class NewsScheduler:
     def stop(self):
         """Scheduler stop करता है"""
         self.running = False
+        self._stop_event.set()
         schedule.clear()
+
+        if self.scheduler_thread is not None:
+            self.scheduler_thread.join(timeout=2)
+            self.scheduler_thread = None
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._executor.shutdown(wait=False)
+            self._loop = None
+            self._loop_thread = None
+
         logger.info("News scheduler stopped")
-    
+
     def _run_scheduler(self):
-        """Scheduler का main loop"""
+        """Scheduler का main loop
+
+        हर second जागने की जगह अगले job की deadline तक सोता है - idle
+        में शून्य wakeups, और stop() का event सोते में भी जगा देता है।
+        """
         while self.running:
             schedule.run_pending()
-            threading.Event().wait(1)
+            delay = schedule.idle_seconds()
+            if delay is None:
+                # कोई job scheduled नहीं - stop तक रुको
+                self._stop_event.wait()
+            elif delay > 0:
+                self._stop_event.wait(delay)
     
     def _run_async(self, coro):
-        """Async function को sync context में run करता है"""
+        """Async function को sync context में run करता है
+
+        Coroutine persistent loop में submit होता है - per-fire loop
+        setup की जगह सिर्फ एक queue push।
+        """
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(coro())
-            loop.close()
+            asyncio.run_coroutine_threadsafe(coro(), self._loop).result()
         except Exception as e:
             logger.error(f"Error running scheduled task: {e}")
     
     async def auto_post_news(self):
         """Scheduled news posts करता है"""
         try:
-            # Get pending scheduled posts
+            # Get pending scheduled posts - bare comparison ताकि partial
+            # index idx_posts_pending use हो (datetime() wrapper index
+            # तोड़ देता था); local now, जैसा बाकी writers store करते हैं
             with self.db._get_connection() as conn:
-                posts = conn.execute('''
-                    SELECT * FROM scheduled_posts 
-                    WHERE status = 'pending' 
-                    AND datetime(scheduled_time) <= datetime('now')
-                    ORDER BY scheduled_time ASC
-                    LIMIT 5
-                ''').fetchall()
+                posts = conn.execute(
+                    _SQL_PENDING_POSTS,
+                    (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),)
+                ).fetchall()
             
+            # Successful posts के updates इकट्ठे करके एक ही transaction
+            # में flush होते हैं - per-post commit/fsync नहीं
+            updates = []
             for post in posts:
                 try:
-                    result = await self.channel_manager.post_to_channel(post['content'])
-                    
+                    # Fixed sleep(5) की जगह shared limiter pacing/back-off
+                    # सम्भालता है
+                    async with _get_limiter():
+                        result = await self.channel_manager.post_to_channel(post['content'])
+
                     if result['success']:
-                        # Update status
-                        with self.db._get_connection() as conn:
-                            conn.execute('''
-                                UPDATE scheduled_posts 
-                                SET status = 'posted', posted_at = ?, message_id = ?
-                                WHERE id = ?
-                            ''', (datetime.now(), result['message_id'], post['id']))
-                            conn.commit()
-                        
+                        updates.append((datetime.now(), result['message_id'], post['id']))
                         logger.info(f"Scheduled post {post['id']} posted successfully")
                     else:
                         logger.error(f"Failed to post scheduled content {post['id']}")
-                
+
                 except Exception as e:
                     logger.error(f"Error posting scheduled content {post['id']}: {e}")
-                    
-                # Rate limiting
-                await asyncio.sleep(5)
-                
+
+            if updates:
+                with self.db.lock:
+                    with self.db._tx() as conn:
+                        conn.executemany(_SQL_MARK_POSTED, updates)
+
         except Exception as e:
             logger.error(f"Error in auto_post_news: {e}")
     
     async def send_daily_report(self):
         """Daily analytics report भेजता है"""
         try:
-            from analytics import Analytics
-            analytics = Analytics()
-            
-            # Get daily stats
+            # Get daily stats - आज के live, yesterday cached
             today_stats = self.db.get_daily_stats()
-            yesterday_stats = self.db.get_daily_stats(
+            yesterday_stats = self._stats_for_date(
                 (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
             )
             
@@ -139,22 +269,39 @@ class NewsScheduler:
 Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
             
-            # Send to admins
-            for admin_id in config.ADMIN_USER_IDS:
-                try:
-                    await self.channel_manager.bot.send_message(
-                        chat_id=admin_id,
-                        text=report_text,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send daily report to admin {admin_id}: {e}")
+            # Send to admins - sequential awaits की जगह concurrent fanout,
+            # limiter concurrency/flood control सम्भालता है
+            results = await asyncio.gather(
+                *(_send_limited(self.channel_manager.bot, admin_id, report_text)
+                  for admin_id in config.ADMIN_USER_IDS),
+                return_exceptions=True
+            )
+            for admin_id, ok in zip(config.ADMIN_USER_IDS, results):
+                if ok is not True:
+                    logger.error(f"Failed to send daily report to admin {admin_id}: {ok}")
             
             logger.info("Daily report sent to admins")
             
         except Exception as e:
             logger.error(f"Error sending daily report: {e}")
     
+    def _stats_for_date(self, date_str: str) -> Dict[str, Any]:
+        """बीती date के stats का in-process cache
+
+        Past days के aggregates कभी नहीं बदलते - SQL round-trip एक ही
+        बार। आज (या आगे) की date cache bypass करती है।
+        """
+        if date_str >= datetime.now().strftime('%Y-%m-%d'):
+            return self.db.get_daily_stats(date_str)
+
+        cached = self._stats_cache.get(date_str)
+        if cached is None:
+            cached = self.db.get_daily_stats(date_str)
+            if len(self._stats_cache) > 32:
+                self._stats_cache.clear()
+            self._stats_cache[date_str] = cached
+        return cached
+
     def _calculate_change(self, current: int, previous: int) -> str:
         """Change percentage calculate करता है"""
         if previous == 0:
@@ -164,6 +311,13 @@ Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         sign = "+" if change > 0 else ""
         return f"{sign}{change:.1f}%"
     
+    def _roll_daily_stats(self):
+        """बीते दिन के stats को daily_rollup में materialize करता है"""
+        try:
+            self.db.roll_daily()
+        except Exception as e:
+            logger.error(f"Daily rollup failed: {e}")
+
     def _cleanup_database(self):
         """Database cleanup करता है"""
         try:
@@ -185,13 +339,15 @@ Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
     def schedule_post(self, content: str, scheduled_time: datetime) -> bool:
         """नया post schedule करता है"""
         try:
-            with self.db._get_connection() as conn:
-                conn.execute('''
-                    INSERT INTO scheduled_posts (content, scheduled_time, status)
-                    VALUES (?, ?, 'pending')
-                ''', (content, scheduled_time))
-                conn.commit()
-            
+            # Store format pending-scan की bound string से exactly match
+            # करता है - default adapter के microseconds comparison में
+            # float नहीं डालते, और datetime adapter deprecation भी नहीं
+            with self.db.lock:
+                with self.db._tx() as conn:
+                    conn.execute(_SQL_INSERT_POST,
+                                 (content, scheduled_time.strftime('%Y-%m-%d %H:%M:%S')))
+
+
             logger.info(f"Post scheduled for {scheduled_time}")
             return True
             
@@ -199,8 +355,12 @@ Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             logger.error(f"Error scheduling post: {e}")
             return False
     
-    def get_scheduled_posts(self, status: str = None) -> List[Dict[str, Any]]:
-        """Scheduled posts की list return करता है"""
+    def get_scheduled_posts(self, status: str = None) -> List[sqlite3.Row]:
+        """Scheduled posts की list return करता है
+
+        Rows sqlite3.Row की तरह ही मिलती हैं - name से access वैसा ही
+        है, पर per-row dict build/copy नहीं होता।
+        """
         try:
             with self.db._get_connection() as conn:
                 if status:
@@ -214,8 +374,8 @@ Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                         SELECT * FROM scheduled_posts 
                         ORDER BY scheduled_time DESC
                     ''').fetchall()
-                
-                return [dict(post) for post in posts]
+
+                return posts
                 
         except Exception as e:
             logger.error(f"Error getting scheduled posts: {e}")
@@ -224,21 +384,19 @@ Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
     def cancel_scheduled_post(self, post_id: int) -> bool:
         """Scheduled post को cancel करता है"""
         try:
-            with self.db._get_connection() as conn:
-                conn.execute('''
-                    UPDATE scheduled_posts 
-                    SET status = 'cancelled'
-                    WHERE id = ? AND status = 'pending'
-                ''', (post_id,))
-                conn.commit()
-                
-                if conn.total_changes > 0:
-                    logger.info(f"Scheduled post {post_id} cancelled")
-                    return True
-                else:
-                    logger.warning(f"Could not cancel post {post_id} - not found or already processed")
-                    return False
-                    
+            with self.db.lock:
+                with self.db._tx() as conn:
+                    cur = conn.execute(_SQL_CANCEL_POST, (post_id,))
+                    changed = cur.rowcount
+
+            if changed > 0:
+                logger.info(f"Scheduled post {post_id} cancelled")
+                return True
+            else:
+                logger.warning(f"Could not cancel post {post_id} - not found or already processed")
+                return False
+
+
         except Exception as e:
             logger.error(f"Error cancelling scheduled post {post_id}: {e}")
             return False
@@ -259,9 +417,13 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
         # Log the error
         logger.error(msg="Exception while handling an update:", exc_info=context.error)
         
-        # Get traceback
-        tb_list = traceback.format_exception(None, context.error, context.error.__traceback__)
-        tb_string = ''.join(tb_list)
+        # Get traceback - formatting CPU-heavy हो सकता है (deep stacks),
+        # thread में offload करके event loop responsive रहता है
+        tb_string = await asyncio.to_thread(
+            lambda: ''.join(traceback.format_exception(
+                None, context.error, context.error.__traceback__
+            ))
+        )
         
         # Prepare error message
         error_message = f"""
@@ -280,16 +442,16 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
 ```
 """
         
-        # Send error to admins
-        for admin_id in config.ADMIN_USER_IDS:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text=error_message,
-                    parse_mode='Markdown'
-                )
-            except Exception as e:
-                logger.error(f"Failed to send error message to admin {admin_id}: {e}")
+        # Send error to admins - concurrent fanout, shared limiter error
+        # bursts में भी Telegram flood control respect करता है
+        results = await asyncio.gather(
+            *(_send_limited(context.bot, admin_id, error_message)
+              for admin_id in config.ADMIN_USER_IDS),
+            return_exceptions=True
+        )
+        for admin_id, ok in zip(config.ADMIN_USER_IDS, results):
+            if ok is not True:
+                logger.error(f"Failed to send error message to admin {admin_id}: {ok}")
         
         # Send user-friendly message if possible
         if update and hasattr(update, 'effective_chat') and update.effective_chat: